@@ -0,0 +1,694 @@
+#id1: 316175827
+#name1: Maayan Oz
+#username1: maayanoz
+#id2: 211627658
+#name2: Amir Arbiv
+#username2: amirarbiv1
+
+
+"""An AVL tree stored as parallel columns instead of node objects.
+
+Every node is an integer handle into the columns of an AVLArrayStore
+(key, value, left, right, parent, height, size). Handle 0 is the virtual
+node: height -1, size 0, and it is never written. Deleted handles go to a
+free list and are reused by later inserts. Trees produced by split share
+the store of the tree they came from, so join between them is O(log n).
+"""
+
+from array import array
+
+NIL = 0 #handle of the virtual node
+
+
+class AVLArrayStore(object):
+
+	"""
+	Constructor, creates the columns with only the virtual node in them.
+	"""
+	def __init__(self):
+		self.key = array('q', [0])
+		self.value = [None]
+		self.left = array('q', [NIL])
+		self.right = array('q', [NIL])
+		self.parent = array('q', [NIL])
+		self.height = array('b', [-1])
+		self.size = array('q', [0])
+		self.free = [] #handles of deleted nodes, reused before the columns grow
+
+
+	"""allocates a new leaf
+
+	@type key: int
+	@param key: key of the new node
+	@type val: string
+	@param val: data of the new node
+	@rtype: int
+	@returns: the handle of the new node
+	"""
+	def new_node(self, key, val): #time complexity O(1) amortized
+		if self.free:
+			h = self.free.pop()
+			self.key[h] = key
+			self.value[h] = val
+			self.left[h] = NIL
+			self.right[h] = NIL
+			self.parent[h] = NIL
+			self.height[h] = 0
+			self.size[h] = 1
+			return h
+		self.key.append(key)
+		self.value.append(val)
+		self.left.append(NIL)
+		self.right.append(NIL)
+		self.parent.append(NIL)
+		self.height.append(0)
+		self.size.append(1)
+		return len(self.value) - 1
+
+
+	def free_node(self, h): #time complexity O(1)
+		self.value[h] = None #drop the reference to the value
+		self.free.append(h)
+
+
+"""
+A class implementing an AVL tree on top of an AVLArrayStore.
+"""
+
+class AVLArrayTree(object):
+
+	"""
+	Constructor.
+
+	@type store: AVLArrayStore
+	@param store: the columns to allocate nodes from, a new store if None
+	"""
+	def __init__(self, store=None):
+		self.store = store if store is not None else AVLArrayStore()
+		self.root = NIL
+		self._size = 0
+		self._min_node = NIL #finger to the minimal node
+		self._max_node = NIL #finger to the maximal node
+
+
+	"""returns the key of a node
+
+	@type h: int
+	@param h: a handle of a node in self
+	@rtype: int
+	"""
+	def key(self, h): #time complexity O(1)
+		return self.store.key[h]
+
+
+	"""returns the value of a node
+
+	@type h: int
+	@param h: a handle of a node in self
+	@rtype: string
+	"""
+	def value(self, h): #time complexity O(1)
+		return self.store.value[h]
+
+
+	"""searches for a node in the dictionary corresponding to the key (starting at the root)
+
+	@type key: int
+	@param key: a key to be searched
+	@rtype: (int,int)
+	@returns: a tuple (x,e) where x is the handle of the node corresponding to key (or None if not found),
+	and e is the number of edges on the path between the starting node and ending node+1.
+	"""
+	def search(self, key): #time complexity O(log n)
+		return self.search_from_node(key, self.root)
+
+
+	def search_from_node(self, key, start_node): #time complexity O(log n)
+    #helping func for search
+		keys = self.store.key
+		left = self.store.left
+		right = self.store.right
+		count = 0
+		curr = start_node
+		while curr != NIL: #regular BST search
+			k = keys[curr]
+			if k == key:
+				return curr, count+1
+			curr = right[curr] if key > k else left[curr]
+			count += 1
+		return None, -1
+
+
+	"""searches for a node in the dictionary corresponding to the key, starting at the max
+
+	@type key: int
+	@param key: a key to be searched
+	@rtype: (int,int)
+	@returns: a tuple (x,e) where x is the handle of the node corresponding to key (or None if not found),
+	and e is the number of edges on the path between the starting node and ending node+1.
+	"""
+	def finger_search(self, key): #time complexity O(log n)
+		if self.root == NIL: #check if tree is empty
+			return None, -1
+		keys = self.store.key
+		parent = self.store.parent
+		count = 0
+		curr = self._max_node
+		while keys[curr] > key and parent[curr] != NIL: #move up until we find the correct subtree
+			curr = parent[curr]
+			count += 1
+		(found, edges) = self.search_from_node(key, curr)
+		if found is not None:
+			return found, edges + count
+		return None, -1
+
+
+	"""inserts a new node into the dictionary with corresponding key and value (starting at the root)
+
+	@type key: int
+	@pre: key currently does not appear in the dictionary
+	@param key: key of item that is to be inserted to self
+	@type val: string
+	@param val: the value of the item
+	@rtype: (int,int,int)
+	@returns: a 3-tuple (x,e,h) where x is the handle of the new node,
+	e is the number of edges on the path between the starting node and new node before rebalancing,
+	and h is the number of rotations during the AVL rebalancing
+	"""
+	def insert(self, key, val): #time complexity O(log n)
+		return self.insert_from_node(key, val, self.root)
+
+
+	def insert_from_node(self, key, val, start_node): #time complexity O(log n)
+    #helping func for insertions
+		st = self.store
+		h = st.new_node(key, val)
+		if self.root == NIL: #check if tree is empty
+			self.root = h
+			self._min_node = h
+			self._max_node = h
+			self._size = 1
+			return h, 0, 0
+
+		keys = st.key
+		left = st.left
+		right = st.right
+		edges = 1
+		curr = start_node
+		while True: #regular BST insert
+			if key < keys[curr]:
+				nxt = left[curr]
+				if nxt == NIL:
+					left[curr] = h
+					break
+			else: #key > keys[curr]
+				nxt = right[curr]
+				if nxt == NIL:
+					right[curr] = h
+					break
+			curr = nxt
+			edges += 1
+		st.parent[h] = curr
+		self._size += 1
+		size = st.size
+		parent = st.parent
+		p = curr
+		while p != NIL: #every ancestor gained one node
+			size[p] += 1
+			p = parent[p]
+		if key < keys[self._min_node]: #move the fingers if needed
+			self._min_node = h
+		elif key > keys[self._max_node]:
+			self._max_node = h
+		rotations = self.rebalance_from(curr)
+		return h, edges, rotations
+
+
+	"""inserts a new node into the dictionary with corresponding key and value, starting at the max
+
+	@type key: int
+	@pre: key currently does not appear in the dictionary
+	@param key: key of item that is to be inserted to self
+	@type val: string
+	@param val: the value of the item
+	@rtype: (int,int,int)
+	@returns: a 3-tuple (x,e,h) as in insert
+	"""
+	def finger_insert(self, key, val): #time complexity O(log n)
+		if self.root == NIL: #check if tree is empty
+			return self.insert_from_node(key, val, NIL)
+		keys = self.store.key
+		parent = self.store.parent
+		edges = 0
+		curr = self._max_node
+		while keys[curr] > key and parent[curr] != NIL: #move up until we find the correct subtree
+			curr = parent[curr]
+			edges += 1
+		(h, search_edges, rotations) = self.insert_from_node(key, val, curr)
+		return h, edges + search_edges, rotations
+
+
+	def rebalance_from(self, node): #time complexity O(log n)
+    #same single pass as AVLTree.rebalance_from: fix each ancestor once, stop when a height holds
+		st = self.store
+		left = st.left
+		right = st.right
+		height = st.height
+		parent = st.parent
+		curr = node
+		rotations = 0
+		while curr != NIL:
+			old_height = height[curr]
+			balance_factor = height[left[curr]] - height[right[curr]]
+			if balance_factor > 1: #left heavy
+				l = left[curr]
+				if height[left[l]] >= height[right[l]]: #left-left case
+					curr = self.rotate_right(curr)
+					rotations += 1
+				else: #left-right case
+					self.rotate_left(l)
+					curr = self.rotate_right(curr)
+			elif balance_factor < -1: #right heavy
+				r = right[curr]
+				if height[right[r]] >= height[left[r]]: #right-right case
+					curr = self.rotate_left(curr)
+					rotations += 1
+				else: #right-left case
+					self.rotate_right(r)
+					curr = self.rotate_left(curr)
+			else:
+				hl = height[left[curr]]
+				hr = height[right[curr]]
+				height[curr] = 1 + (hl if hl > hr else hr)
+			if height[curr] == old_height: #early termination
+				break
+			curr = parent[curr]
+		return rotations
+
+
+	def rotate_left(self, x): #time complexity O(1)
+    #returns the new root of the subtree
+		st = self.store
+		left = st.left
+		right = st.right
+		parent = st.parent
+		y = right[x]
+		b = left[y]
+		p = parent[x]
+		right[x] = b
+		if b != NIL:
+			parent[b] = x
+		left[y] = x
+		parent[x] = y
+		parent[y] = p
+		if p == NIL:
+			self.root = y
+		elif left[p] == x:
+			left[p] = y
+		else:
+			right[p] = y
+		self.update_node(x)
+		self.update_node(y)
+		return y
+
+
+	def rotate_right(self, x): #time complexity O(1)
+    #code is similar to rotate_left
+		st = self.store
+		left = st.left
+		right = st.right
+		parent = st.parent
+		y = left[x]
+		b = right[y]
+		p = parent[x]
+		left[x] = b
+		if b != NIL:
+			parent[b] = x
+		right[y] = x
+		parent[x] = y
+		parent[y] = p
+		if p == NIL:
+			self.root = y
+		elif left[p] == x:
+			left[p] = y
+		else:
+			right[p] = y
+		self.update_node(x)
+		self.update_node(y)
+		return y
+
+
+	def update_node(self, h): #time complexity O(1)
+    #recompute height and size of h from its children
+		st = self.store
+		l = st.left[h]
+		r = st.right[h]
+		hl = st.height[l]
+		hr = st.height[r]
+		st.height[h] = 1 + (hl if hl > hr else hr)
+		st.size[h] = 1 + st.size[l] + st.size[r]
+
+
+	"""deletes node from the dictionary
+
+	@type node: int
+	@pre: node is a handle of a node in self
+	@post: the handle is released and may be reused by a later insert
+	"""
+	def delete(self, node): #time complexity O(log n)
+		st = self.store
+		if self._size == 1: #only root exists
+			st.free_node(node)
+			self.root = NIL
+			self._min_node = NIL
+			self._max_node = NIL
+			self._size = 0
+			return
+		#move the fingers before unlinking, a finger node has at most one child
+		if node == self._min_node:
+			self._min_node = self.successor(node)
+		if node == self._max_node:
+			self._max_node = self.predecessor(node)
+
+		left = st.left
+		right = st.right
+		parent = st.parent
+		if left[node] != NIL and right[node] != NIL: #node has two children
+			succ = self.successor(node)
+			st.key[node] = st.key[succ]
+			st.value[node] = st.value[succ]
+			self.delete(succ) #succ has no left child
+			return
+		child = left[node] if left[node] != NIL else right[node]
+		p = parent[node]
+		if child != NIL:
+			parent[child] = p
+		if p == NIL: #node is root
+			self.root = child
+		elif left[p] == node:
+			left[p] = child
+		else:
+			right[p] = child
+		st.free_node(node)
+		size = st.size
+		q = p
+		while q != NIL: #every ancestor lost one node
+			size[q] -= 1
+			q = parent[q]
+		if p != NIL:
+			self.rebalance_from(p)
+		self._size -= 1
+
+
+	"""joins self with item and another AVLArrayTree
+
+	@type tree2: AVLArrayTree
+	@param tree2: a dictionary to be joined with self, it is copied into the store of self
+	if it uses a different store
+	@type key: int
+	@param key: the key separting self and tree2
+	@type val: string
+	@param val: the value corresponding to key
+	@pre: all keys in self are smaller than key and all keys in tree2 are larger than key,
+	or the opposite way
+	"""
+	def join(self, tree2, key, val): #time complexity O(log n) on a shared store
+		if tree2.store is not self.store:
+			tree2 = AVLArrayTree.from_sorted(tree2.avl_to_array(), self.store)
+		self.join_node(tree2, self.store.new_node(key, val))
+
+
+	def join_node(self, tree2, h): #time complexity O(|height difference| + 1)
+    #same as AVLTree.join_node, h is a detached node of the shared store
+		st = self.store
+		keys = st.key
+		left = st.left
+		right = st.right
+		parent = st.parent
+		height = st.height
+		size = st.size
+		key = keys[h]
+		if self.root != NIL:
+			self_is_low = keys[self.root] < key
+		else:
+			self_is_low = tree2.root == NIL or keys[tree2.root] > key
+		low, high = (self, tree2) if self_is_low else (tree2, self)
+		low_root = low.root
+		high_root = high.root
+		self._min_node = low._min_node if low_root != NIL else h
+		self._max_node = high._max_node if high_root != NIL else h
+		self._size = low._size + high._size + 1
+
+		p = NIL
+		if height[low_root] >= height[high_root]: #go down the right spine of low
+			curr = low_root
+			while height[curr] > height[high_root]:
+				p = curr
+				curr = right[curr]
+			left[h] = curr
+			right[h] = high_root
+			if p != NIL:
+				right[p] = h
+			new_root = low_root
+		else: #go down the left spine of high
+			curr = high_root
+			while height[curr] > height[low_root]:
+				p = curr
+				curr = left[curr]
+			left[h] = low_root
+			right[h] = curr
+			if p != NIL:
+				left[p] = h
+			new_root = high_root
+		if left[h] != NIL:
+			parent[left[h]] = h
+		if right[h] != NIL:
+			parent[right[h]] = h
+		self.update_node(h)
+		parent[h] = p
+		if p == NIL:
+			self.root = h
+			return
+		self.root = new_root
+		q = p
+		while q != NIL: #the spine above h holds the shorter tree now
+			size[q] = 1 + size[left[q]] + size[right[q]]
+			q = parent[q]
+		self.rebalance_from(p)
+
+
+	"""splits the dictionary at a given node
+
+	@type node: int
+	@pre: node is a handle of a node in self
+	@param node: the node in the dictionary to be used for the split
+	@rtype: (AVLArrayTree, AVLArrayTree)
+	@returns: a tuple (left, right) of trees on the store of self, holding the keys smaller and
+	larger than the key of node, the handle of node is released. self is left empty, its nodes
+	now belong to left and right
+	"""
+	def split(self, node): #time complexity O(log n)
+		left, mid, right = self.split_rec(self.root, self.store.key[node])
+		self.store.free_node(mid)
+		left.reset_fingers()
+		right.reset_fingers()
+		self.root = NIL
+		self._size = 0
+		self._min_node = NIL
+		self._max_node = NIL
+		return left, right
+
+
+	def split_rec(self, node, key): #time complexity O(log n), the join heights telescope
+    #helper function for split, returns (left, mid, right)
+		st = self.store
+		if node == NIL:
+			return AVLArrayTree(st), None, AVLArrayTree(st)
+		k = st.key[node]
+		if k < key:
+			left, mid, right = self.split_rec(st.right[node], key)
+			t_org_l = self.detach_subtree(st.left[node])
+			t_org_l.join_node(left, node)
+			return t_org_l, mid, right
+		elif k > key:
+			left, mid, right = self.split_rec(st.left[node], key)
+			t_org_r = self.detach_subtree(st.right[node])
+			t_org_r.join_node(right, node)
+			return left, mid, t_org_r
+		else: #k == key
+			return self.detach_subtree(st.left[node]), node, self.detach_subtree(st.right[node])
+
+
+	def detach_subtree(self, h): #time complexity O(1)
+    #wraps the subtree of h in a new tree on the same store, the fingers are left unset
+		tree = AVLArrayTree(self.store)
+		if h != NIL:
+			self.store.parent[h] = NIL
+			tree.root = h
+			tree._size = self.store.size[h]
+		return tree
+
+
+	"""builds a balanced dictionary from a sorted list of items
+
+	@type items: list
+	@pre: the keys of items are strictly increasing
+	@param items: a list of touples (key, value)
+	@type store: AVLArrayStore
+	@param store: the columns to allocate nodes from, a new store if None
+	@rtype: AVLArrayTree
+	"""
+	@classmethod
+	def from_sorted(cls, items, store=None): #time complexity O(n)
+		tree = cls(store)
+		st = tree.store
+
+		def build(lo, hi, p): #builds items[lo:hi] below p, returns the subtree root
+			if lo >= hi:
+				return NIL
+			mid = (lo + hi) // 2
+			h = st.new_node(items[mid][0], items[mid][1])
+			st.parent[h] = p
+			st.left[h] = build(lo, mid, h)
+			st.right[h] = build(mid + 1, hi, h)
+			tree.update_node(h)
+			return h
+
+		tree.root = build(0, len(items), NIL)
+		tree._size = len(items)
+		tree.reset_fingers()
+		return tree
+
+
+	def reset_fingers(self): #time complexity O(log n)
+    #recompute the min and max fingers by walking down both spines
+		left = self.store.left
+		right = self.store.right
+		curr = self.root
+		if curr != NIL:
+			while left[curr] != NIL:
+				curr = left[curr]
+		self._min_node = curr
+		curr = self.root
+		if curr != NIL:
+			while right[curr] != NIL:
+				curr = right[curr]
+		self._max_node = curr
+
+
+	def successor(self, node): #time complexity O(log n)
+		left = self.store.left
+		right = self.store.right
+		parent = self.store.parent
+		if right[node] != NIL: #go right once and then left until we reach the min
+			curr = right[node]
+			while left[curr] != NIL:
+				curr = left[curr]
+			return curr
+		curr = node
+		while parent[curr] != NIL and right[parent[curr]] == curr:
+			curr = parent[curr]
+		return parent[curr] #NIL if no successor exists
+
+
+	def predecessor(self, node): #time complexity O(log n)
+    #mirror image of successor
+		left = self.store.left
+		right = self.store.right
+		parent = self.store.parent
+		if left[node] != NIL:
+			curr = left[node]
+			while right[curr] != NIL:
+				curr = right[curr]
+			return curr
+		curr = node
+		while parent[curr] != NIL and left[parent[curr]] == curr:
+			curr = parent[curr]
+		return parent[curr] #NIL if no predecessor exists
+
+
+	"""yields the items with lo <= key <= hi in sorted order, all of them if no bounds are given
+
+	@type lo: int
+	@param lo: lower end of the range (inclusive), None for no lower end
+	@type hi: int
+	@param hi: upper end of the range (inclusive), None for no upper end
+	@pre: the dictionary is not changed while the generator is in use
+	@rtype: generator
+	@returns: a generator of touples (key, value)
+	"""
+	def range(self, lo=None, hi=None): #time complexity O(log n + k) for k items
+		st = self.store
+		keys = st.key
+		left = st.left
+		right = st.right
+		parent = st.parent
+		if lo is None:
+			curr = self._min_node
+		else: #seek the smallest key that is at least lo
+			curr = NIL
+			node = self.root
+			while node != NIL:
+				if keys[node] < lo:
+					node = right[node]
+				else:
+					curr = node
+					node = left[node]
+		while curr != NIL:
+			key = keys[curr]
+			if hi is not None and key > hi:
+				return
+			yield key, st.value[curr]
+			if right[curr] != NIL: #successor written inline
+				curr = right[curr]
+				while left[curr] != NIL:
+					curr = left[curr]
+			else:
+				while parent[curr] != NIL and right[parent[curr]] == curr:
+					curr = parent[curr]
+				curr = parent[curr]
+
+
+	"""returns the items of the dictionary in sorted order
+
+	@rtype: generator
+	@returns: a generator of touples (key, value)
+	"""
+	def items(self): #time complexity O(n)
+		return self.range()
+
+
+	"""returns an array representing dictionary
+
+	@rtype: list
+	@returns: a sorted list according to key of touples (key, value) representing the data structure
+	"""
+	def avl_to_array(self): #time complexity O(n)
+		return list(self.range())
+
+
+	"""returns the handle of the node with the maximal key in the dictionary
+
+	@rtype: int
+	@returns: the maximal node, None if the dictionary is empty
+	"""
+	def max_node(self): #time complexity O(1)
+		return self._max_node if self._max_node != NIL else None
+
+
+	"""returns the number of items in dictionary
+
+	@rtype: int
+	@returns: the number of items in dictionary
+	"""
+	def size(self): #time complexity O(1)
+		return self._size
+
+
+	"""returns the handle of the root of the tree representing the dictionary
+
+	@rtype: int
+	@returns: the root, None if the dictionary is empty
+	"""
+	def get_root(self): #time complexity O(1)
+		return self.root if self.root != NIL else None
@@ -0,0 +1,233 @@
+#id1: 316175827
+#name1: Maayan Oz
+#username1: maayanoz
+#id2: 211627658
+#name2: Amir Arbiv
+#username2: amirarbiv1
+
+
+"""An AVL index whose nodes live in an mmap'ed file.
+
+The file is a 64-byte header followed by fixed-size 64-byte records, one per
+node, each holding eight little-endian int64 fields:
+
+	key, value, left, right, parent, height, size, (spare)
+
+Children and parents are record numbers. Record 0 is the virtual node. A
+node is read straight out of the mapping, so the OS page cache decides what
+stays in memory, and a key set larger than RAM only costs page faults on
+the cold parts of the tree. The store offers the same columns as
+AVLArrayStore, so AVLDiskTree reuses every algorithm of AVLArrayTree. Keys
+and values are 64-bit ints. A value is typically an offset into a data file.
+"""
+
+import mmap
+import os
+from AVLArrayTree import AVLArrayTree, NIL
+
+HEADER_BYTES = 64
+RECORD_FIELDS = 8
+RECORD_BYTES = 8 * RECORD_FIELDS
+MAGIC = 0x31544C5641 #"AVLT1" read as a little-endian int
+
+#header fields, as int64 indexes
+H_MAGIC, H_CAPACITY, H_USED, H_FREE, H_ROOT, H_SIZE, H_MIN, H_MAX = range(8)
+
+#record fields, as int64 offsets inside a record
+F_KEY, F_VALUE, F_LEFT, F_RIGHT, F_PARENT, F_HEIGHT, F_SIZE = range(7)
+
+
+class DiskField(object):
+    #one field of every record, indexed by handle like an array.array column
+	__slots__ = ("words", "offset")
+
+	def __init__(self, offset):
+		self.words = None #int64 view of the records, replaced whenever the file grows
+		self.offset = offset
+
+	def __getitem__(self, h):
+		return self.words[h * RECORD_FIELDS + self.offset]
+
+	def __setitem__(self, h, val):
+		self.words[h * RECORD_FIELDS + self.offset] = val
+
+
+"""
+The columns of an AVLArrayStore, kept in a memory-mapped file.
+"""
+
+class AVLDiskStore(object):
+
+	"""
+	Constructor, opens path or creates it if it does not exist.
+
+	@type path: str
+	@param path: the index file
+	@type capacity: int
+	@param capacity: number of records to reserve when the file is created
+	"""
+	def __init__(self, path, capacity=1024):
+		self.key = DiskField(F_KEY)
+		self.value = DiskField(F_VALUE)
+		self.left = DiskField(F_LEFT)
+		self.right = DiskField(F_RIGHT)
+		self.parent = DiskField(F_PARENT)
+		self.height = DiskField(F_HEIGHT)
+		self.size = DiskField(F_SIZE)
+		self.fields = (self.key, self.value, self.left, self.right, self.parent, self.height, self.size)
+
+		length = os.path.getsize(path) if os.path.exists(path) else 0
+		new = length == 0
+		if not new and (length < HEADER_BYTES or (length - HEADER_BYTES) % RECORD_BYTES): #checked before mapping it
+			raise ValueError("%s is not an AVLDiskTree file" % path)
+		self.file = open(path, "r+b" if not new else "w+b")
+		if new:
+			capacity = max(capacity, 2)
+			self.file.truncate(HEADER_BYTES + capacity * RECORD_BYTES)
+		self.mm = mmap.mmap(self.file.fileno(), 0)
+		self.map_views()
+		if new:
+			self.header[H_MAGIC] = MAGIC
+			self.header[H_CAPACITY] = capacity
+			self.header[H_USED] = 1 #record 0 is the virtual node
+			self.height[NIL] = -1
+		elif self.header[H_MAGIC] != MAGIC or HEADER_BYTES + self.header[H_CAPACITY] * RECORD_BYTES != length:
+			self.close()
+			raise ValueError("%s is not an AVLDiskTree file" % path)
+
+
+	def map_views(self): #time complexity O(1)
+		self.header = memoryview(self.mm)[:HEADER_BYTES].cast("q")
+		words = memoryview(self.mm)[HEADER_BYTES:].cast("q")
+		for field in self.fields:
+			field.words = words
+
+
+	def unmap_views(self): #time complexity O(1)
+    #mmap can only be resized or closed once no memoryview points into it
+		words = self.key.words
+		for field in self.fields:
+			field.words = None
+		words.release()
+		self.header.release()
+
+
+	def grow(self): #time complexity O(capacity), amortized O(1) per node
+		capacity = self.header[H_CAPACITY] * 2
+		self.unmap_views()
+		self.mm.resize(HEADER_BYTES + capacity * RECORD_BYTES)
+		self.map_views()
+		self.header[H_CAPACITY] = capacity
+
+
+	"""allocates a new leaf
+
+	@type key: int
+	@param key: key of the new node
+	@type val: int
+	@param val: data of the new node
+	@rtype: int
+	@returns: the handle of the new node
+	"""
+	def new_node(self, key, val): #time complexity O(1) amortized
+		header = self.header
+		h = header[H_FREE]
+		if h != NIL: #reuse a deleted record, the free list is chained through left
+			header[H_FREE] = self.left[h]
+		else:
+			h = header[H_USED]
+			if h == header[H_CAPACITY]:
+				self.grow()
+				header = self.header
+			header[H_USED] = h + 1
+		words = self.key.words
+		base = h * RECORD_FIELDS
+		words[base + F_KEY] = key
+		words[base + F_VALUE] = val
+		words[base + F_LEFT] = NIL
+		words[base + F_RIGHT] = NIL
+		words[base + F_PARENT] = NIL
+		words[base + F_HEIGHT] = 0
+		words[base + F_SIZE] = 1
+		return h
+
+
+	def free_node(self, h): #time complexity O(1)
+		self.value[h] = 0
+		self.left[h] = self.header[H_FREE]
+		self.header[H_FREE] = h
+
+
+	def flush(self): #time complexity O(dirty pages)
+		self.mm.flush()
+
+
+	def close(self):
+		if self.mm is not None:
+			self.unmap_views()
+			self.mm.close()
+			self.file.close()
+			self.mm = None
+
+
+def header_property(index):
+    #a tree attribute that is stored in the file header instead of on the object
+	def get(self):
+		return self.store.header[index]
+
+	def set(self, val):
+		self.store.header[index] = val
+
+	return property(get, set)
+
+
+"""
+A class implementing an AVL index on top of an AVLDiskStore.
+"""
+
+class AVLDiskTree(AVLArrayTree):
+
+	"""
+	Constructor, opens the index at path or creates an empty one.
+
+	@type path: str
+	@param path: the index file
+	"""
+	def __init__(self, path, capacity=1024):
+		self.store = AVLDiskStore(path, capacity)
+
+	#the tree state of AVLArrayTree, kept in the header so it survives a reopen
+	root = header_property(H_ROOT)
+	_size = header_property(H_SIZE)
+	_min_node = header_property(H_MIN)
+	_max_node = header_property(H_MAX)
+
+
+	"""not supported: the halves would be in-memory trees sharing the records of the file,
+	while the header still described the whole index
+
+	@raises TypeError: always, the index is left as it was
+	"""
+	def split(self, node):
+		raise TypeError("split is not supported on a disk index")
+
+
+	"""writes dirty pages back to the file"""
+	def flush(self):
+		self.store.flush()
+
+
+	"""flushes and closes the file, the tree cannot be used afterwards. Closing it again does nothing"""
+	def close(self):
+		if self.store.mm is not None:
+			self.store.flush()
+			self.store.close()
+
+
+	def __enter__(self):
+		return self
+
+
+	def __exit__(self, *exc):
+		self.close()
+		return False
@@ -3,7 +3,7 @@
 # - Inserts always start searching from max_node (finger).
 # - Adds insertion_sort(arr) that:
 #     1) inserts the numbers in the given order (like insertion sort process),
-#     2) does an in-order scan to output the sorted array,
+#     2) does an in-order scan (iterative, via parent pointers) to output the sorted array,
 #     3) returns (sorted_array, rebalance_ops, search_ops)
 #
 # Definitions requested:
@@ -15,6 +15,14 @@
 # Notes:
 # - Duplicates are supported: we store a frequency counter in node.value (an int),
 #   and output duplicates accordingly in the sorted array.
+# - insertion_sort(arr, adaptive=True) is an extension outside the assignment spec:
+#   it keeps min, max and last-inserted fingers and bulk-appends sorted runs,
+#   so sorted, reverse-sorted and nearly sorted inputs cost O(n) search_ops.
+# - push / pop_min / pop_max / peek_min / peek_max are an extension too: they
+#   use the tree as a double-ended priority queue of keys (with duplicates).
+
+# shortest run that adaptive insertion_sort appends in one join
+RUN_MIN = 8
 
 class AVLNode:
     __slots__ = ("key", "value", "left", "right", "parent", "height")
@@ -32,7 +40,7 @@ class AVLNode:
 
 
 class AVLFingerTree:
-    def __init__(self):
+    def __init__(self, stats=None):
         self.root = None
         self.min_node = None
         self.max_node = None
@@ -42,14 +50,26 @@ class AVLFingerTree:
         self._search_ops = 0
         self._rebalance_ops = 0
 
+        # optional AVLStats (see AVLStats.py): insertion_sort adds its totals and
+        # the rebalancing cases to it; without one nothing extra is counted
+        self.stats = stats
+
     # ----------------------------
     # PUBLIC: insertion_sort
     # ----------------------------
-    def insertion_sort(self, arr):
+    def insertion_sort(self, arr, adaptive=False):
         """
         Insert numbers in the given order (like insertion sort processing),
         then in-order traverse to produce the sorted array.
 
+        adaptive=False follows the assignment: every insert starts at max_node.
+        adaptive=True starts each insert at min_node, max_node or the last
+        inserted node, whichever is closest to the key, and joins every
+        increasing run above the max (or decreasing run below the min) of at
+        least RUN_MIN keys as one balanced subtree. Each key of such a run
+        costs one search op, and the nodes built for it are not counted as
+        height changes; only the rebalancing after the join is.
+
         Returns:
             (sorted_array, rebalance_ops, search_ops)
         """
@@ -62,15 +82,137 @@ class AVLFingerTree:
         self._rebalance_ops = 0
 
         # Insert each item (in the same order as insertion sort would process)
-        for x in arr:
-            self._insert_with_stats(x)
+        if adaptive:
+            self._insert_all_adaptive(arr)
+        else:
+            for x in arr:
+                self._insert_with_stats(x)
 
-        # In-order scan => sorted
-        out = []
-        self._inorder_to_list(self.root, out)
+        if self.stats is not None:
+            self.stats.node_visits += self._search_ops
+            self.stats.height_changes += self._rebalance_ops
+
+        # In-order scan => sorted (duplicates expanded by __iter__)
+        out = list(self)
 
         return (out, self._rebalance_ops, self._search_ops)
 
+    # ----------------------------
+    # PUBLIC: double-ended priority queue
+    # ----------------------------
+    def push(self, key):
+        """
+        Add one copy of key. The search starts at min_node or max_node,
+        whichever side of the root key lies on, so keys pushed near either
+        end cost O(1) search steps besides the rebalancing.
+        """
+        if self.root is None:
+            self._insert_with_stats(key)
+            return
+        if key >= self.max_node.key:
+            start = self.max_node
+        elif key <= self.min_node.key or key < self.root.key:
+            start = self.min_node
+        else:
+            start = self.max_node
+
+        parent, direction, existing = self._find_parent_from_finger(start, key)
+        if existing is not None:
+            existing.value += 1
+            return
+
+        new_node = AVLNode(key, 1, parent=parent)
+        if direction < 0:
+            parent.left = new_node
+        else:
+            parent.right = new_node
+        self.size += 1
+        self._update_min_max_on_insert(new_node)
+        self._rebalance_up(parent)
+
+    def peek_min(self):
+        """Smallest key, without removing it. IndexError if empty."""
+        if self.min_node is None:
+            raise IndexError("peek from an empty tree")
+        return self.min_node.key
+
+    def peek_max(self):
+        """Largest key, without removing it. IndexError if empty."""
+        if self.max_node is None:
+            raise IndexError("peek from an empty tree")
+        return self.max_node.key
+
+    def pop_min(self):
+        """
+        Remove and return one copy of the smallest key. IndexError if empty.
+
+        The min node has no left child, so it is spliced out by hanging its
+        right child (a single leaf at most) on its parent, and min_node
+        moves to that child or else to the parent: O(1) finger upkeep.
+        Rebalancing stops at the first subtree that keeps its height.
+        """
+        node = self.min_node
+        if node is None:
+            raise IndexError("pop from an empty tree")
+        if node.value > 1:
+            node.value -= 1
+            return node.key
+
+        child = node.right
+        parent = node.parent
+        self._replace_child(node, child)
+        if child is not None:
+            self.min_node = self._far_node(child, left=True)
+        else:
+            self.min_node = parent
+        if self.max_node is node:  # it was the only node
+            self.max_node = None
+        self.size -= 1
+        if parent is not None:
+            self._rebalance_up(parent)
+        return node.key
+
+    def pop_max(self):
+        """
+        Remove and return one copy of the largest key. IndexError if empty.
+        Mirror image of pop_min.
+        """
+        node = self.max_node
+        if node is None:
+            raise IndexError("pop from an empty tree")
+        if node.value > 1:
+            node.value -= 1
+            return node.key
+
+        child = node.left
+        parent = node.parent
+        self._replace_child(node, child)
+        if child is not None:
+            self.max_node = self._far_node(child, left=False)
+        else:
+            self.max_node = parent
+        if self.min_node is node:
+            self.min_node = None
+        self.size -= 1
+        if parent is not None:
+            self._rebalance_up(parent)
+        return node.key
+
+    def _replace_child(self, node, child):
+        """Hang child (may be None) where node hangs, detaching node."""
+        parent = node.parent
+        if parent is None:
+            self.root = child
+        elif parent.left is node:
+            parent.left = child
+        else:
+            parent.right = child
+        if child is not None:
+            child.parent = parent
+        node.parent = None
+        node.left = None
+        node.right = None
+
     # ----------------------------
     # INSERT (with stats)
     # ----------------------------
@@ -109,6 +251,159 @@ class AVLFingerTree:
         if self.max_node is None or node.key > self.max_node.key:
             self.max_node = node
 
+    # ----------------------------
+    # ADAPTIVE INSERT (with stats)
+    # ----------------------------
+    def _insert_all_adaptive(self, arr):
+        n = len(arr)
+        last = None
+        i = 0
+        while i < n:
+            x = arr[i]
+            j = i + 1
+            if self.root is None or x > self.max_node.key:
+                while j < n and arr[j] > arr[j - 1]:
+                    j += 1
+                if j - i >= RUN_MIN:
+                    last = self._join_run(arr[i:j], append=True)
+                    i = j
+                    continue
+            elif x < self.min_node.key:
+                while j < n and arr[j] < arr[j - 1]:
+                    j += 1
+                if j - i >= RUN_MIN:
+                    run = list(arr[i:j])
+                    run.reverse()
+                    last = self._join_run(run, append=False)
+                    i = j
+                    continue
+            last = self._insert_adaptive(x, last)
+            i += 1
+
+    def _insert_adaptive(self, key, last):
+        if self.root is None:
+            return self._insert_with_stats(key)
+
+        if key > self.max_node.key:
+            self._search_ops += 1
+            parent, direction, existing = self.max_node, +1, None
+        elif key < self.min_node.key:
+            self._search_ops += 1
+            parent, direction, existing = self.min_node, -1, None
+        else:
+            # the finger closest in key, a stand-in for the closest in rank;
+            # last climbs to bounds on both sides, so it has to be clearly closer
+            if self.max_node.key - key <= key - self.min_node.key:
+                start = self.max_node
+            else:
+                start = self.min_node
+            if last is not None and abs(last.key - key) * 4 < abs(start.key - key):
+                start = last
+            parent, direction, existing = self._find_parent_from_finger(start, key)
+
+        if existing is not None:
+            existing.value += 1  # duplicate
+            return existing
+
+        new_node = AVLNode(key, 1, parent=parent)
+        if direction < 0:
+            parent.left = new_node
+        else:
+            parent.right = new_node
+
+        self.size += 1
+        self._update_min_max_on_insert(new_node)
+        self._rebalance_from(parent)
+        return new_node
+
+    # ----------------------------
+    # BULK APPEND of a sorted run
+    # ----------------------------
+    def _join_run(self, run, append):
+        """
+        run: strictly increasing keys, all above max_node (append=True) or
+        all below min_node (append=False). Builds them as a balanced subtree
+        and joins it to the tree through one separating node, like AVLTree.join.
+        Returns the node of the key inserted last (in arr order).
+        """
+        self._search_ops += len(run)  # every key is compared once, with its neighbour in arr
+        self.size += len(run)
+        if self.root is None:
+            self.root = self._build_balanced(run, 0, len(run), None)
+            self.min_node = self._far_node(self.root, left=True)
+            self.max_node = self._far_node(self.root, left=False)
+            return self.max_node
+
+        if append:
+            mid = AVLNode(run[0], 1)
+            side = self._build_balanced(run, 1, len(run), None)
+            self._join(self.root, mid, side)
+            self.max_node = self._far_node(side, left=False) if side is not None else mid
+            return self.max_node
+
+        mid = AVLNode(run[-1], 1)
+        side = self._build_balanced(run, 0, len(run) - 1, None)
+        self._join(side, mid, self.root)
+        self.min_node = self._far_node(side, left=True) if side is not None else mid
+        return self.min_node
+
+    def _build_balanced(self, run, lo, hi, parent, counts=None):
+        # counts[i] is the frequency of run[i], 1 for every key if counts is None
+        if lo >= hi:
+            return None
+        m = (lo + hi) // 2
+        node = AVLNode(run[m], 1 if counts is None else counts[m], parent=parent)
+        node.left = self._build_balanced(run, lo, m, node, counts)
+        node.right = self._build_balanced(run, m + 1, hi, node, counts)
+        self._update_height_no_count(node)
+        return node
+
+    def _far_node(self, node, left):
+        if left:
+            while node.left is not None:
+                node = node.left
+        else:
+            while node.right is not None:
+                node = node.right
+        return node
+
+    def _join(self, left, mid, right):
+        """
+        All keys of left < mid.key < all keys of right. Go down the inner
+        spine of the taller side to a subtree about as high as the other
+        side, hang both under mid there and rebalance upward.
+        """
+        hl = self._h(left)
+        hr = self._h(right)
+        parent = None
+        if hl > hr + 1:
+            root = left
+            while self._h(left) > hr + 1:
+                parent = left
+                left = left.right
+            parent.right = mid
+        elif hr > hl + 1:
+            root = right
+            while self._h(right) > hl + 1:
+                parent = right
+                right = right.left
+            parent.left = mid
+        else:
+            root = mid
+
+        mid.parent = parent
+        mid.left = left
+        mid.right = right
+        if left is not None:
+            left.parent = mid
+        if right is not None:
+            right.parent = mid
+        self._update_height_no_count(mid)
+
+        self.root = root
+        if parent is not None:
+            self._rebalance_from(parent)
+
     # ----------------------------
     # SEARCH from max finger (counts node visits)
     # ----------------------------
@@ -132,12 +427,47 @@ class AVLFingerTree:
         if key == start.key:
             return (start, 0, start)
 
-        # climb up from max until root (count every node we step onto)
+        # climb up from max until root (count every node we step onto);
+        # climb onto an equal ancestor too, so a duplicate finds its node
         a = start
-        while a.parent is not None and key < a.parent.key:
+        while a.parent is not None and key <= a.parent.key:
             a = a.parent
             self._search_ops += 1
 
+        return self._descend_from(a, key)
+
+    def _find_parent_from_finger(self, start, key):
+        """
+        Same as _find_parent_for_insert_from_max, from any node: climb until
+        the subtree of the current node is the only place key can be, then
+        descend. Counting is the same (start, climbed and descended nodes).
+        """
+        self._search_ops += 1
+        a = start
+        if key == a.key:
+            return (a, 0, a)
+
+        # a's subtree holds key once an ancestor on the far side bounds it
+        if key > a.key:
+            while a.parent is not None and not (a is a.parent.left and key < a.parent.key):
+                a = a.parent
+                self._search_ops += 1
+                if key == a.key:
+                    return (a, 0, a)
+        else:
+            while a.parent is not None and not (a is a.parent.right and key > a.parent.key):
+                a = a.parent
+                self._search_ops += 1
+                if key == a.key:
+                    return (a, 0, a)
+
+        return self._descend_from(a, key)
+
+    def _descend_from(self, a, key):
+        """
+        Returns (parent, direction, existing_node_or_None) for key, searching
+        down from a, which the caller has already counted.
+        """
         # now descend BST-search from 'a' (count every visited node)
         node = a
         parent = None
@@ -280,33 +610,111 @@ class AVLFingerTree:
         while cur is not None:
             # update height + conditional counting
             self._update_height_conditionally(cur)
-
-            bf = self._balance_factor(cur)
-
-            # rotations (NOT counted)
-            if bf > 1:
-                if self._balance_factor(cur.left) < 0:
-                    self._rotate_left(cur.left)
-                self._rotate_right(cur)
-
-            elif bf < -1:
-                if self._balance_factor(cur.right) > 0:
-                    self._rotate_right(cur.right)
-                self._rotate_left(cur)
-
+            self._fix_balance(cur)
             cur = cur.parent
 
+    def _rebalance_up(self, node):
+        """
+        Same as _rebalance_from, but stop at the first subtree whose height
+        did not change: nothing above it can be out of balance. Works after
+        a removal too, where a rotation may leave the subtree lower.
+        """
+        cur = node
+        while cur is not None:
+            old_h = cur.height
+            self._update_height_conditionally(cur)
+            top = self._fix_balance(cur)
+            if top.height == old_h:
+                return
+            cur = top.parent
+
+    def _fix_balance(self, cur):
+        """Rotate at cur if it is out of balance; returns the subtree's new root."""
+        bf = self._balance_factor(cur)
+
+        # rotations (NOT counted in rebalance_ops, only by case in self.stats)
+        if bf > 1:
+            if self._balance_factor(cur.left) < 0:
+                self._rotate_left(cur.left)
+                if self.stats is not None:
+                    self.stats.rotations_lr += 1
+            elif self.stats is not None:
+                self.stats.rotations_ll += 1
+            return self._rotate_right(cur)
+
+        if bf < -1:
+            if self._balance_factor(cur.right) > 0:
+                self._rotate_right(cur.right)
+                if self.stats is not None:
+                    self.stats.rotations_rl += 1
+            elif self.stats is not None:
+                self.stats.rotations_rr += 1
+            return self._rotate_left(cur)
+
+        return cur
+
 
     # ----------------------------
-    # In-order traversal to list (handles duplicates via node.value)
+    # In-order traversal (iterative, follows parent pointers)
     # ----------------------------
-    def _inorder_to_list(self, node, out):
-        if node is None:
-            return
-        self._inorder_to_list(node.left, out)
-        # append duplicates
-        freq = node.value
-        while freq > 0:
-            out.append(node.key)
-            freq -= 1
-        self._inorder_to_list(node.right, out)
+    def _iter_nodes(self, reverse=False):
+        """
+        Yield the nodes in key order (or reverse order) without recursion
+        or an explicit stack: step to the successor/predecessor through
+        parent pointers. O(n) in total, O(1) extra memory.
+        """
+        cur = self.max_node if reverse else self.min_node
+        while cur is not None:
+            yield cur
+            nxt = cur.left if reverse else cur.right
+            if nxt is not None:
+                # one step down, then all the way to the far side
+                if reverse:
+                    while nxt.right is not None:
+                        nxt = nxt.right
+                else:
+                    while nxt.left is not None:
+                        nxt = nxt.left
+                cur = nxt
+            else:
+                # climb until we arrive from the near side
+                while cur.parent is not None and (cur.parent.left if reverse else cur.parent.right) is cur:
+                    cur = cur.parent
+                cur = cur.parent
+
+    def __iter__(self):
+        """Keys in sorted order, each repeated by its frequency."""
+        # same walk as _iter_nodes, written inline since this is the hot export path
+        cur = self.min_node
+        while cur is not None:
+            freq = cur.value
+            while freq > 0:
+                yield cur.key
+                freq -= 1
+            nxt = cur.right
+            if nxt is not None:
+                while nxt.left is not None:
+                    nxt = nxt.left
+                cur = nxt
+            else:
+                while cur.parent is not None and cur.parent.right is cur:
+                    cur = cur.parent
+                cur = cur.parent
+
+    def __reversed__(self):
+        """Keys in descending order, each repeated by its frequency."""
+        for node in self._iter_nodes(reverse=True):
+            freq = node.value
+            while freq > 0:
+                yield node.key
+                freq -= 1
+
+    def keys(self):
+        """Distinct keys in sorted order."""
+        for node in self._iter_nodes():
+            yield node.key
+
+    def items(self):
+        """(key, frequency) pairs in sorted order."""
+        for node in self._iter_nodes():
+            yield (node.key, node.value)
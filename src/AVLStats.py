@@ -0,0 +1,60 @@
+#id1: 316175827
+#name1: Maayan Oz
+#username1: maayanoz
+#id2: 211627658
+#name2: Amir Arbiv
+#username2: amirarbiv1
+
+
+"""Optional operation counters for AVLTree and AVLFingerTree.
+
+A tree only counts when it is given an AVLStats, as in AVLTree(AVLStats()).
+Without one, the hot loops keep their counts in local variables they need
+anyway, and each operation pays a single "is None" check when it finishes.
+Several trees may share one AVLStats to get totals.
+"""
+
+
+"""
+A collector of counters, all of them start at 0.
+
+node_visits: nodes compared on the way down by searches and inserts
+climbs: edges climbed up from a finger (max, min or a given node) before going down
+height_updates: nodes visited by the rebalancing walk after an update
+height_changes: nodes whose height changed without a rotation (the PROMOTE cases)
+rotations_ll, rotations_rr, rotations_lr, rotations_rl: rebalancing by case,
+ll is a single right rotation and lr is a left rotation then a right one
+"""
+
+class AVLStats(object):
+	__slots__ = ("node_visits", "climbs", "height_updates", "height_changes",
+		"rotations_ll", "rotations_rr", "rotations_lr", "rotations_rl")
+
+	def __init__(self):
+		self.reset()
+
+
+	"""sets every counter back to 0"""
+	def reset(self): #time complexity O(1)
+		for name in AVLStats.__slots__:
+			setattr(self, name, 0)
+
+
+	"""returns the number of single rotations, a double rotation counts as two
+
+	@rtype: int
+	"""
+	def rotations(self): #time complexity O(1)
+		return self.rotations_ll + self.rotations_rr + 2 * (self.rotations_lr + self.rotations_rl)
+
+
+	"""returns the counters by name
+
+	@rtype: dict
+	"""
+	def as_dict(self): #time complexity O(1)
+		return dict((name, getattr(self, name)) for name in AVLStats.__slots__)
+
+
+	def __repr__(self):
+		return "AVLStats(%s)" % ", ".join("%s=%d" % item for item in self.as_dict().items())
@@ -5,6 +5,8 @@
 #name2: Amir Arbiv
 #username2: amirarbiv1
 
+import struct
+
 
 """A class represnting a node in an AVL tree"""
 
@@ -16,17 +18,21 @@ class AVLNode(object):
 	@type value: string
 	@param value: data of your node
 	"""
+	__slots__ = ("key", "value", "left", "right", "parent", "height", "size", "dead", "is_virtual")
+
 	def __init__(self, key, value, is_virtual=False):
 		self.key = key
 		self.value = value
 		if is_virtual:
 			self.left = None
 			self.right = None
-		else:
-			self.left = AVLNode(-1, "", True)
-			self.right = AVLNode(-1, "", True)
+		else: #all missing children point at the one shared virtual node
+			self.left = VIRTUAL
+			self.right = VIRTUAL
 		self.parent = None
 		self.height = 0 if not is_virtual else -1
+		self.size = 1 if not is_virtual else 0 #number of real nodes in the subtree of self
+		self.dead = 0 #number of lazily deleted nodes in the subtree of self, they are left out of size
 		"""Indicates whether the node is a virtual node
 		@type: bool
 		"""
@@ -41,6 +47,44 @@ class AVLNode(object):
 		return not self.is_virtual
 
 
+"""The virtual leaf shared by the whole module. It is read-only, so no real
+node can ever be hung below it or have its fields copied into it by mistake.
+"""
+
+class _VirtualNode(AVLNode):
+	__slots__ = ()
+
+	def __init__(self):
+		for field, val in (("key", None), ("value", None), ("left", None), ("right", None),
+				("parent", None), ("height", -1), ("size", 0), ("dead", 0), ("is_virtual", True)):
+			object.__setattr__(self, field, val)
+
+	def __setattr__(self, name, value):
+		raise AttributeError("the shared virtual node is read-only")
+
+	def __repr__(self):
+		return "VIRTUAL"
+
+
+VIRTUAL = _VirtualNode()
+
+
+"""Binary dump format: DUMP_MAGIC, then one record per item in increasing key order,
+a little-endian signed 64-bit key and an unsigned 32-bit length followed by that many
+bytes of UTF-8 value.
+"""
+
+DUMP_MAGIC = b"AVLT\x01"
+DUMP_RECORD = struct.Struct("<qI")
+
+
+"""The value of a lazily deleted node, see the lazy_threshold of AVLTree. Such a node keeps
+its key and its place in the tree, but searches and iteration act as if it was not there.
+"""
+
+TOMBSTONE = object()
+
+
 """
 A class implementing an AVL tree.
 """
@@ -49,10 +93,170 @@ class AVLTree(object):
 
 	"""
 	Constructor, you are allowed to add more fields.
+
+	@type stats: AVLStats
+	@param stats: a collector for operation counters, or None to count nothing.
+	It may also be set or replaced later through the stats field
+	@type multiset: bool
+	@param multiset: if True the tree is a multiset of keys, see add: every node holds
+	the number of copies of its key in value, and iteration repeats each key that many times
+	@type lazy_threshold: float
+	@param lazy_threshold: None for the usual deletion. A fraction between 0 and 1 turns on
+	lazy deletion: delete only marks a node as a TOMBSTONE and takes it out of the subtree
+	sizes, and once more than this fraction of the nodes are marked the tree is rebuilt
+	without them, see rebuild. Trees split off a lazy tree are lazy too
 	"""
-	def __init__(self):
+	def __init__(self, stats=None, multiset=False, lazy_threshold=None):
+		if lazy_threshold is not None:
+			if multiset:
+				raise ValueError("lazy deletion needs a dictionary tree, not a multiset")
+			if not 0 < lazy_threshold < 1:
+				raise ValueError("lazy_threshold must be between 0 and 1")
 		self.root = None
-		self._size = 0 #added field
+		self._size = 0 #added field, counts live items only
+		self._dead = 0 #number of lazily deleted nodes still in the tree, root.dead when there is a root
+		self._min_node = None #finger to the minimal node, kept up to date by every update
+		self._max_node = None #finger to the maximal node, kept up to date by every update
+		self.stats = stats #optional AVLStats, see AVLStats.py
+		self.multiset = multiset
+		self.lazy_threshold = lazy_threshold
+
+
+	"""builds a balanced dictionary from items given in increasing key order, without rotations
+
+	@type items: iterable
+	@pre: the keys of items are strictly increasing
+	@param items: (key, value) pairs, may be a generator, it is read only once
+	@rtype: AVLTree
+	@returns: a new tree holding exactly the given items
+	"""
+	@classmethod
+	def from_sorted(cls, items): #time complexity O(n)
+    #perfect subtrees are built like a binary counter: each finished one waits on the stack
+    #with the separator that follows it, and two waiting perfect trees of the same height
+    #are merged under their separator as soon as the second one is complete
+		tree = cls()
+		stack = [] #(perfect left subtree, separator node), heights strictly decreasing to the top
+		carry = None #a finished perfect subtree still waiting for the next separator
+		for key, val in items:
+			node = AVLNode(key, val)
+			if tree._min_node is None:
+				tree._min_node = node
+			tree._max_node = node
+			tree._size += 1
+			if carry is not None: #node separates carry from whatever comes next
+				stack.append((carry, node))
+				carry = None
+				continue
+			carry = node
+			while stack and stack[-1][0].height == carry.height:
+				left, sep = stack.pop()
+				sep.left = left
+				sep.right = carry
+				left.parent = sep
+				carry.parent = sep
+				sep.height = carry.height + 1
+				sep.size = left.size + carry.size + 1
+				carry = sep
+
+		#glue the leftovers from the smallest to the largest, every left piece is perfect and
+		#at least as tall as what was glued so far, so this never needs a rotation
+		right = carry if carry is not None else VIRTUAL
+		while stack:
+			left, sep = stack.pop()
+			parent = None
+			curr = left
+			while curr.height > right.height: #go down the right spine of left
+				parent = curr
+				curr = curr.right
+			sep.left = curr
+			sep.right = right
+			if curr.is_real_node():
+				curr.parent = sep
+			if right.is_real_node():
+				right.parent = sep
+			sep.height = right.height + 1
+			sep.size = curr.size + right.size + 1
+			if parent is None:
+				right = sep
+				continue
+			parent.right = sep
+			sep.parent = parent
+			while parent is not None: #the spine above sep grew by one
+				parent.height = 1 + max(parent.left.height, parent.right.height)
+				parent.size = 1 + parent.left.size + parent.right.size
+				parent = parent.parent
+			right = left
+		if right.is_real_node():
+			tree.root = right
+		return tree
+
+
+	"""writes the dictionary to a file in the binary dump format
+
+	@type path: str
+	@param path: the file to write, it is overwritten
+	@pre: the keys are ints that fit in 64 bits and the values are strings
+	"""
+	def dump(self, path, chunk_size=1 << 20): #time complexity O(n), O(chunk_size) extra memory
+		pack = DUMP_RECORD.pack
+		with open(path, "wb") as f:
+			f.write(DUMP_MAGIC)
+			buf = bytearray()
+			for node in self.iter_nodes():
+				val = node.value.encode("utf-8")
+				buf += pack(node.key, len(val))
+				buf += val
+				if len(buf) >= chunk_size: #flush a full chunk
+					f.write(buf)
+					buf.clear()
+			f.write(buf)
+
+
+	"""reads a file written by dump back into a balanced dictionary
+
+	@type path: str
+	@param path: a file written by dump
+	@rtype: AVLTree
+	@returns: a new tree, built by from_sorted while the file is being read
+	"""
+	@classmethod
+	def load(cls, path): #time complexity O(n)
+		return cls.from_sorted(cls.read_dump(path))
+
+
+	"""reads the items of a dump file one chunk at a time
+
+	@type path: str
+	@param path: a file written by dump
+	@rtype: generator
+	@returns: a generator of touples (key, value) in increasing key order
+	"""
+	@staticmethod
+	def read_dump(path, chunk_size=1 << 20): #time complexity O(n), O(chunk_size) extra memory
+		unpack_from = DUMP_RECORD.unpack_from
+		head = DUMP_RECORD.size
+		with open(path, "rb") as f:
+			if f.read(len(DUMP_MAGIC)) != DUMP_MAGIC:
+				raise ValueError("%s is not an AVLTree dump" % path)
+			buf = b""
+			pos = 0
+			while True:
+				chunk = f.read(chunk_size)
+				if not chunk:
+					break
+				buf = buf[pos:] + chunk #keep the partial record at the end of the last chunk
+				pos = 0
+				end = len(buf)
+				while pos + head <= end:
+					(key, length) = unpack_from(buf, pos)
+					stop = pos + head + length
+					if stop > end:
+						break
+					yield key, buf[pos + head:stop].decode("utf-8")
+					pos = stop
+			if pos != len(buf):
+				raise ValueError("%s ends in the middle of a record" % path)
 
 
 	"""searches for a node in the dictionary corresponding to the key (starting at the root)
@@ -73,16 +277,17 @@ class AVLTree(object):
     #helping func for search
 		count = 0
 		curr = start_node
-		while curr.key != key: #regular BST search
-			if not curr.is_real_node():
-				return None, -1
+		while not curr.is_virtual and curr.key != key: #regular BST search
 			if key > curr.key:
 				curr = curr.right
 				count += 1
 			else: #key < curr.key
 				curr = curr.left
 				count += 1
-			
+		if self.stats is not None:
+			self.stats.node_visits += count if curr.is_virtual else count+1
+		if curr.is_virtual or curr.value is TOMBSTONE: #a lazily deleted key is not found either
+			return None, -1
 		return curr, count+1
 
 
@@ -101,12 +306,43 @@ class AVLTree(object):
 			return None, -1
 
 		count = 0
-		curr = self.max_node()
+		curr = self._max_node
 		while curr.key > key: #move up until we find the correct subtree
 			if curr.parent is None:
 				break
 			curr = curr.parent
 			count += 1
+		if self.stats is not None:
+			self.stats.climbs += count
+		(found, edges) = self.search_from_node(key, curr) #search from the found subtree
+		if found is not None:
+			return found, edges + count
+
+		return None, -1
+
+
+	"""searches for a node in the dictionary corresponding to the key, starting at the min
+        
+	@type key: int
+	@param key: a key to be searched
+	@rtype: (AVLNode,int)
+	@returns: a tuple (x,e) where x is the node corresponding to key (or None if not found),
+	and e is the number of edges on the path between the starting node and ending node+1.
+	"""
+	def finger_search_min(self, key): #time complexity O(log n)
+    #mirror image of finger_search
+		if self.root is None: #check if tree is empty
+			return None, -1
+
+		count = 0
+		curr = self._min_node
+		while curr.key < key: #move up until we find the correct subtree
+			if curr.parent is None:
+				break
+			curr = curr.parent
+			count += 1
+		if self.stats is not None:
+			self.stats.climbs += count
 		(found, edges) = self.search_from_node(key, curr) #search from the found subtree
 		if found is not None:
 			return found, edges + count
@@ -114,6 +350,51 @@ class AVLTree(object):
 		return None, -1
 
 
+	"""searches for a node in the dictionary corresponding to the key, starting at any node of the tree.
+	It climbs from node until the subtree it is in covers key, then searches down,
+	so a key near node (a cursor, the last node used) is found without going through the root
+        
+	@type node: AVLNode
+	@pre: node is a real node in self
+	@param node: the node to start from
+	@type key: int
+	@param key: a key to be searched
+	@rtype: (AVLNode,int)
+	@returns: a tuple (x,e) where x is the node corresponding to key (or None if not found),
+	and e is the number of edges on the path between the starting node and ending node+1.
+	"""
+	def search_near(self, node, key): #time complexity O(log n), O(log d) for a key d ranks from node if no high ancestor is crossed
+		if self.root is None: #check if tree is empty
+			return None, -1
+		(curr, count) = self.climb_to_cover(node, key)
+		(found, edges) = self.search_from_node(key, curr) #search from the found subtree
+		if found is not None:
+			return found, edges + count
+		return None, -1
+
+
+	def climb_to_cover(self, node, key): #time complexity O(log n)
+    #helping func for search_near and insert_near, climbs while the parent is on key's side of node
+    #(or is key itself), since then the subtree of node cannot hold key. Returns (subtree root, edges climbed)
+		curr = node
+		edges = 0
+		if key > self._max_node.key: #the right child of the max is empty, so it covers every larger key
+			return self._max_node, 0
+		if key < self._min_node.key:
+			return self._min_node, 0
+		if key > node.key:
+			while curr.parent is not None and curr.parent.key <= key:
+				curr = curr.parent
+				edges += 1
+		elif key < node.key:
+			while curr.parent is not None and curr.parent.key >= key:
+				curr = curr.parent
+				edges += 1
+		if self.stats is not None:
+			self.stats.climbs += edges
+		return curr, edges
+
+
 	"""inserts a new node into the dictionary with corresponding key and value (starting at the root)
 
 	@type key: int
@@ -146,13 +427,16 @@ class AVLTree(object):
 	and h is the number of PROMOTE cases during the AVL rebalancing
 """
 
-	def insert_from_node(self, key, val, start_node): #time complexity O(log n)
-    #helping func for insertions
+	def insert_from_node(self, key, val, start_node, dirty=None): #time complexity O(log n)
+    #helping func for insertions. With a dirty set the ancestors are only marked in it instead of
+    #having their sizes incremented, and fix_dirty_sizes has to be called once the batch is done
 		edges = 0
 		new_node = AVLNode(key, val)
 		curr = start_node
 		if self.root is None: #check if tree is empty
 			self.root = new_node
+			self._min_node = new_node
+			self._max_node = new_node
 			self._size += 1
 			return new_node, 0, 0
 
@@ -166,6 +450,21 @@ class AVLTree(object):
 					new_node.parent = curr
 					edges += 1
 					break
+			elif key == curr.key and curr.value is TOMBSTONE: #the lazily deleted node of key comes back
+				curr.value = val
+				self._dead -= 1
+				self._size += 1
+				if self.stats is not None:
+					self.stats.node_visits += edges + 1
+				if dirty is not None:
+					self.mark_dirty(curr, dirty)
+					return curr, edges, 0
+				node = curr
+				while node is not None: #it counts in the subtree sizes again
+					node.size += 1
+					node.dead -= 1
+					node = node.parent
+				return curr, edges, 0
 			else: #key > curr.key
 				if curr.right.is_real_node():
 					curr = curr.right
@@ -176,24 +475,24 @@ class AVLTree(object):
 					edges += 1
 					break
 		self._size += 1
-		self.update_heights(new_node) #fix heights after insertion
-		rotations = self.rebalance_after_insert(key, new_node)
+		if self.stats is not None:
+			self.stats.node_visits += edges
+		if dirty is not None:
+			self.mark_dirty(new_node, dirty)
+		else:
+			curr = new_node.parent
+			while curr is not None: #every ancestor gained one node
+				curr.size += 1
+				curr = curr.parent
+		if key < self._min_node.key: #move the fingers if needed
+			self._min_node = new_node
+		elif key > self._max_node.key:
+			self._max_node = new_node
+		rotations = self.rebalance_after_insert(key, new_node) #fix heights after insertion
 		
 		return new_node, edges, rotations
     
 
-	""" updates heights going up from the inserted node
-	@type node: AVLNode
-	@param node: the newly inserted node
-	"""
-	def update_heights(self, node): #time complexity O(log n)
-		curr = node.parent
-		while curr is not None:
-			curr.height = 1 + max(curr.right.height, curr.left.height)
-			curr = curr.parent
-		return None
-
-
 	""" returns the balance factor of a node
 	@type node: AVLNode
 	@param node: the node to calculate the balance factor for
@@ -215,32 +514,67 @@ class AVLTree(object):
 	@returns: number of rotations performed during rebalancing
 	"""
 
-	def rebalance_after_insert(self, key, node): #time complexity O(log n)
-    #rebalancing and updating heights going up from the inserted node
-		curr = node.parent
+	def rebalance_after_insert(self, key, node): #time complexity O(log n), O(1) amortized
+		return self.rebalance_from(node.parent)
+
+
+	""" fixes heights and rotates going up from a node whose subtree height may have changed
+	@type node: AVLNode
+	@param node: the lowest node to fix, all of its descendants must already be correct
+	@rtype: int
+	@returns: number of rotations performed during rebalancing
+	"""
+
+	def rebalance_from(self, node): #time complexity O(log n)
+    #every ancestor is fixed once, and we stop as soon as a subtree ends up with the
+    #same height it had before, since nothing above it can have changed
+		curr = node
 		rotations = 0
+		visited = 0 #counted in locals, and handed to self.stats once at the end
+		promoted = 0
+		stats = self.stats
 		while curr is not None:
-			self.update_heights(curr) #update heights
-			balance_factor = self.get_bf(curr)
+			visited += 1
+			old_height = curr.height
+			balance_factor = curr.left.height - curr.right.height
 
 			if balance_factor > 1: #left heavy
 				if self.get_bf(curr.left) >= 0: #left-left case
 					self.rotate_right(curr)
 					rotations += 1
+					if stats is not None:
+						stats.rotations_ll += 1
 				else: #left-right case
 					self.rotate_left(curr.left)
 					self.rotate_right(curr)
 					#rotations += 2 what they said not to count
+					if stats is not None:
+						stats.rotations_lr += 1
+				curr = curr.parent #the new root of this subtree
 			elif balance_factor < -1: #right heavy
 				if self.get_bf(curr.right) <= 0: #right-right case
 					self.rotate_left(curr)
 					rotations += 1
+					if stats is not None:
+						stats.rotations_rr += 1
 				else: #right-left case
 					self.rotate_right(curr.right)
 					self.rotate_left(curr)
 					#rotations += 2 what they said not to count
+					if stats is not None:
+						stats.rotations_rl += 1
+				curr = curr.parent #the new root of this subtree
+			else:
+				curr.height = 1 + max(curr.left.height, curr.right.height)
+				if curr.height != old_height:
+					promoted += 1
 
+			if curr.height == old_height: #early termination
+				break
 			curr = curr.parent
+		if stats is not None:
+			stats.height_updates += visited
+			stats.height_changes += promoted
 		return rotations
 
 
@@ -261,23 +595,192 @@ class AVLTree(object):
 
 	def finger_insert(self, key, val): #time complexity O(log n)
 		if self.root is None: #check if tree is empty
-			new_node = AVLNode(key, val)
-			self.root = new_node
-			self._size += 1
-			return new_node, 0, 0
+			return self.insert_from_node(key, val, None)
 		edges = 0
-		curr = self.max_node()
+		curr = self._max_node
 		while curr.key > key: #move up until we find the correct subtree
 			if curr.parent is None:
 				break
 			curr = curr.parent
 			edges += 1
+		if self.stats is not None:
+			self.stats.climbs += edges
 		(new_node, search_edges, rotations) = self.insert_from_node(key, val, curr) #insert from the found subtree
 		edges += search_edges
-		self.update_heights(new_node)
 		return new_node, edges, rotations
 
 
+	"""inserts a new node into the dictionary with corresponding key and value, starting at the min
+
+	@type key: int
+	@pre: key currently does not appear in the dictionary
+	@param key: key of item that is to be inserted to self
+	@type val: string
+	@param val: the value of the item
+	@rtype: (AVLNode,int,int)
+	@returns: a 3-tuple (x,e,h) where x is the new node,
+	e is the number of edges on the path between the starting node and new node before rebalancing,
+	and h is the number of PROMOTE cases during the AVL rebalancing
+	"""
+
+	def finger_insert_min(self, key, val): #time complexity O(log n)
+    #mirror image of finger_insert
+		if self.root is None: #check if tree is empty
+			return self.insert_from_node(key, val, None)
+		edges = 0
+		curr = self._min_node
+		while curr.key < key: #move up until we find the correct subtree
+			if curr.parent is None:
+				break
+			curr = curr.parent
+			edges += 1
+		if self.stats is not None:
+			self.stats.climbs += edges
+		(new_node, search_edges, rotations) = self.insert_from_node(key, val, curr) #insert from the found subtree
+		edges += search_edges
+		return new_node, edges, rotations
+
+
+
+
+	"""inserts a new node into the dictionary with corresponding key and value, starting at any node of the tree,
+	see search_near
+
+	@type node: AVLNode
+	@pre: node is a real node in self, or None if the dictionary is empty
+	@param node: the node to start from
+	@type key: int
+	@pre: key currently does not appear in the dictionary
+	@param key: key of item that is to be inserted to self
+	@type val: string
+	@param val: the value of the item
+	@rtype: (AVLNode,int,int)
+	@returns: a 3-tuple (x,e,h) where x is the new node,
+	e is the number of edges on the path between the starting node and new node before rebalancing,
+	and h is the number of PROMOTE cases during the AVL rebalancing
+	"""
+
+	def insert_near(self, node, key, val): #time complexity O(log n), O(log d) for a key d ranks from node if no high ancestor is crossed
+		if self.root is None: #check if tree is empty
+			return self.insert_from_node(key, val, None)
+		(curr, edges) = self.climb_to_cover(node, key)
+		(new_node, search_edges, rotations) = self.insert_from_node(key, val, curr) #insert from the found subtree
+		return new_node, edges + search_edges, rotations
+
+
+
+
+	"""inserts a batch of items, sorting it once and walking a finger from each new node to the next
+
+	@type pairs: iterable
+	@pre: no key of pairs currently appears in the dictionary, and the keys of pairs are distinct
+	@param pairs: (key, value) pairs in any order
+	@rtype: (int,int)
+	@returns: a tuple (e,h) with the sums over the batch of the e and h values that insert returns,
+	where each e is counted from the previous new node instead of from the root
+	"""
+	def insert_many(self, pairs): #time complexity O(m log(n/m + 1)) after an O(m log m) sort
+    #walking up to the root to increment the sizes would cost O(log n) per key, so the ancestors
+    #are only marked dirty (stopping at the first marked one) and their sizes are recomputed at the end.
+    #The marked nodes are the union of the m insertion paths, which has O(m log(n/m + 1)) nodes
+		edges = 0
+		rotations = 0
+		finger = None
+		dirty = set()
+		for key, val in sorted(pairs, key=lambda item: item[0]):
+			if finger is None: #the first key of the batch starts at the root
+				(finger, e, h) = self.insert_from_node(key, val, self.root, dirty)
+			else: #the keys only grow, so each one starts at the last new node
+				(curr, climbed) = self.climb_to_cover(finger, key)
+				(finger, e, h) = self.insert_from_node(key, val, curr, dirty)
+				e += climbed
+			edges += e
+			rotations += h
+		self.fix_dirty_sizes(dirty)
+		return edges, rotations
+
+
+	def mark_dirty(self, node, dirty): #time complexity O(log n), O(1) amortized over a batch
+    #helping func for insert_many, marks node and its ancestors up to the first one already marked,
+    #so the marked set stays closed under taking parents (the rotations only move marked nodes)
+		while node is not None and node not in dirty:
+			dirty.add(node)
+			node = node.parent
+
+
+	def fix_dirty_sizes(self, dirty): #time complexity O(|dirty|)
+    #helping func for insert_many, recomputes the counts of the marked nodes children first.
+    #The unmarked subtrees were not touched, and every marked node hangs from a marked parent
+		if self.root is None or self.root not in dirty:
+			return
+		stack = [(self.root, False)]
+		while stack:
+			(node, children_done) = stack.pop()
+			if children_done:
+				node.size = (node.value is not TOMBSTONE) + node.left.size + node.right.size
+				node.dead = (node.value is TOMBSTONE) + node.left.dead + node.right.dead
+				continue
+			stack.append((node, True))
+			if node.left in dirty:
+				stack.append((node.left, False))
+			if node.right in dirty:
+				stack.append((node.right, False))
+
+
+
+
+	"""adds one copy of key to a multiset tree, a key that is already there only has its count incremented
+
+	@type key: int
+	@param key: the key to add
+	@rtype: (AVLNode,int)
+	@returns: a tuple (x,c) where x is the node of key and c is its count after the addition
+	"""
+	def add(self, key): #time complexity O(log n)
+		if not self.multiset:
+			raise ValueError("add needs a multiset tree, use AVLTree(multiset=True)")
+		node = self.search(key)[0]
+		if node is None:
+			node = self.insert(key, 1)[0]
+		else:
+			node.value += 1
+		return node, node.value
+
+
+	"""removes one copy of key from a multiset tree, and its node with the last copy
+
+	@type key: int
+	@param key: the key to remove
+	@rtype: bool
+	@returns: True if key was there, False if nothing changed
+	"""
+	def remove_one(self, key): #time complexity O(log n)
+		if not self.multiset:
+			raise ValueError("remove_one needs a multiset tree, use AVLTree(multiset=True)")
+		node = self.search(key)[0]
+		if node is None:
+			return False
+		if node.value > 1:
+			node.value -= 1
+		else:
+			self.delete(node)
+		return True
+
+
+	"""returns the number of copies of key
+
+	@type key: int
+	@param key: a key to be searched
+	@rtype: int
+	@returns: the count of key in a multiset tree, and 1 or 0 in a dictionary
+	"""
+	def count(self, key): #time complexity O(log n)
+		node = self.search(key)[0]
+		if node is None:
+			return 0
+		return node.value if self.multiset else 1
+
+
 
 
 	"""performs a rotation on the given unbalanced node
@@ -329,12 +832,14 @@ class AVLTree(object):
 
 
 	def update_heights_after_rotation(self, node): #time complexity O(1)
-    #updating heights after rotation using update_heights
+    #recomputes the height and counts of a rotated node from its children, the children first
 		if node.right.is_real_node():
 			node.right.height = 1 + max(node.right.left.height, node.right.right.height)
 		if node.left.is_real_node():
 			node.left.height = 1 + max(node.left.left.height, node.left.right.height)
 		node.height = 1 + max(node.left.height, node.right.height)
+		node.size = (node.value is not TOMBSTONE) + node.left.size + node.right.size #the subtree sizes change as well
+		node.dead = (node.value is TOMBSTONE) + node.left.dead + node.right.dead
 		return None
 				
 
@@ -343,17 +848,59 @@ class AVLTree(object):
 	@type node: AVLNode
 	@pre: node is a real pointer to a node in self
 	"""
-	def delete(self, node): #time complexity O(log n)
-		if self._size == 1: #only root exists
+	def delete(self, node): #time complexity O(log n), O(1) amortized with lazy_threshold
+		if self.lazy_threshold is None:
+			self.delete_node(node)
+			return
+		if node is not self._min_node and node is not self._max_node: #only mark it
+			node.value = TOMBSTONE
+			self._dead += 1
+			self._size -= 1
+			curr = node
+			while curr is not None: #the subtree sizes count live nodes only
+				curr.size -= 1
+				curr.dead += 1
+				curr = curr.parent
+		else: #a finger node is really removed, see drop_dead_fingers
+			self.delete_node(node)
+			self.drop_dead_fingers()
+		if self._dead > self.lazy_threshold * (self._size + self._dead):
+			self.rebuild()
+
+
+	def drop_dead_fingers(self): #time complexity O(log n) for every node removed
+    #really removes every marked node at either end of the tree, so the fingers always point
+    #at live nodes. Each marked node is removed at most once, so this is O(log n) amortized
+		while self._max_node is not None and self._max_node.value is TOMBSTONE:
+			self.delete_node(self._max_node)
+		while self._min_node is not None and self._min_node.value is TOMBSTONE:
+			self.delete_node(self._min_node)
+
+
+	def delete_node(self, node): #time complexity O(log n)
+    #helping func for delete, removes node from the tree and rebalances. node may be marked,
+    #then the subtree sizes and self._size already left it out and it is taken off the dead counts
+		if node.parent is None and not node.left.is_real_node() and not node.right.is_real_node(): #only root exists
 			self.root = None
+			self._min_node = None
+			self._max_node = None
 			self._size = 0
+			self._dead = 0
 			return
-		elif node.right.is_real_node() is False and node.left.is_real_node() is False: #node is a leaf
+		live = node.value is not TOMBSTONE
+		#move the fingers before unlinking, a finger node has at most one child
+		if node is self._min_node:
+			self._min_node = self.successor(node)
+		if node is self._max_node:
+			self._max_node = self.predecessor(node)
+
+		parent = node.parent
+		if node.right.is_real_node() is False and node.left.is_real_node() is False: #node is a leaf
 			if node.parent:
 				if node.parent.left == node:
-					node.parent.left = AVLNode(-1, "", True)
+					node.parent.left = VIRTUAL
 				else:
-					node.parent.right = AVLNode(-1, "", True)
+					node.parent.right = VIRTUAL
 			node.parent = None
 		elif node.right.is_real_node() is False and node.left.is_real_node() is True: #node has only left child
 			if node.parent is None: #node is root
@@ -377,16 +924,82 @@ class AVLTree(object):
 				node.right.parent = node.parent
 		else: #node has two children
 			succ = self.successor(node)
+			succ_live = succ.value is not TOMBSTONE
 			node.key = succ.key
 			node.value = succ.value
-			self._size += 1 #to cancel out the decrement inside
-			self.delete(succ)
-		if node.parent is not None:
-			self.rebalance_after_insert(node.parent.key, node.parent) #rebalance from parent
-		self._size -= 1
+			self.delete_node(succ) #succ has no left child, so this is one of the cases above
+			if succ_live != live: #the counts were fixed for the item of succ, node took its place
+				curr = node
+				while curr is not None:
+					curr.size += succ_live - live
+					curr.dead += live - succ_live
+					curr = curr.parent
+				self._size += succ_live - live
+				self._dead += live - succ_live
+			return
+		if parent is not None:
+			curr = parent
+			while curr is not None: #every ancestor lost one node
+				if live:
+					curr.size -= 1
+				else:
+					curr.dead -= 1
+				curr = curr.parent
+			self.rebalance_from(parent) #rebalance from parent
+		if live:
+			self._size -= 1
+		else:
+			self._dead -= 1
 		return
 
-	
+
+	"""deletes the item of key, searching for its node first
+
+	@type key: int
+	@param key: key of the item to delete
+	@rtype: int
+	@returns: the number of deleted items, 1 if key was found and 0 otherwise
+	"""
+	def delete_key(self, key): #time complexity O(log n)
+		node = self.search(key)[0]
+		if node is None:
+			return 0
+		self.delete(node)
+		return 1
+
+
+	"""deletes all items with lo <= key <= hi by cutting them out with two splits and one join
+
+	@type lo: int
+	@param lo: lower end of the range (inclusive)
+	@type hi: int
+	@param hi: upper end of the range (inclusive)
+	@type return_tree: bool
+	@param return_tree: if True the removed items are returned as an AVLTree instead of counted
+	@rtype: int or AVLTree
+	@returns: the number of deleted items, or an AVLTree holding them if return_tree is True
+	"""
+	def delete_range(self, lo, hi, return_tree=False): #time complexity O(log n), however many keys are in the range
+		removed = AVLTree(self.stats, self.multiset, self.lazy_threshold)
+		if self.root is not None and lo <= hi:
+			below, low_node, rest = self.split_at(self.root, lo)
+			inside, high_node, above = rest.split_at(rest.root if rest.root is not None else VIRTUAL, hi)
+			removed = inside
+			if low_node is not None: #lo and hi themselves are in the range too
+				removed.join_node(AVLTree(self.stats, self.multiset, self.lazy_threshold), low_node)
+			if high_node is not None:
+				removed.join_node(AVLTree(self.stats, self.multiset, self.lazy_threshold), high_node)
+			kept = self.concat(below, above)
+			self.root = kept.root
+			self._size = kept._size
+			self._dead = kept._dead
+			self.reset_fingers()
+			removed.reset_fingers()
+		if return_tree:
+			return removed
+		return removed._size
+
+
 	"""joins self with item and another AVLTree
 
 	@type tree2: AVLTree 
@@ -399,97 +1012,77 @@ class AVLTree(object):
 	or the opposite way
 	"""
 	def join(self, tree2, key, val): #time complexity O(log n)
-		#handle edge cases
-		if tree2.root is None and self.root is None: #both trees are empty
-			new_node = AVLNode(key, val)
-			self.root = new_node
-			self._size = 1
-			return
-		if self.root is None: #self is empty
-			tree2.insert(key, val)
-			self.root = tree2.root
-			self._size = tree2._size
-			return
-		if tree2.root is None: #tree2 is empty
-			self.insert(key, val)
-			return
+		self.join_node(tree2, AVLNode(key, val))
 
-		new_node = AVLNode(key, val)
-		#check which tree is bigger
-		#start from the root of the bigger tree and go down the left/right spine until heights are equal
-		#then insert new_node there and attach the smaller tree
-		if self.root.height >= tree2.root.height: #self is bigger
-			if key < self.root.key: #self's keys are larger
-				curr = self.root 
-				#go left until we find the correct spot to insert new_node
-				while curr.left.height > tree2.root.height:
-					curr = curr.left
-				new_node.right = curr.left
-				if new_node.right.is_real_node():
-					new_node.right.parent = new_node
-				new_node.left = tree2.root
-				tree2.root.parent = new_node
-				self.update_heights(new_node)
-				new_node.parent = curr
-				curr.left = new_node
-				self._size += tree2._size + 1
-    
-			else: #tree2's keys are larger 
-				curr = self.root 
-				#go right until we find the correct spot to insert new_node
-				while curr.right.height > tree2.root.height:
-					curr = curr.right
-				new_node.left = curr.right
-				if new_node.left.is_real_node():
-					new_node.left.parent = new_node
-				new_node.right = tree2.root
-				tree2.root.parent = new_node
-				tree2.update_heights(new_node)
-				new_node.parent = curr
-				curr.right = new_node
-				self._size += tree2._size + 1
-
-		else: #tree2 is bigger
-			if key < self.root.key: #self's keys are larger				
-				curr = tree2.root 
-				#go left until we find the correct spot to insert new_node
-				while curr.right.height > self.root.height:
-					curr = curr.right
-				new_node.left = curr.right
-				if new_node.left.is_real_node():
-					new_node.left.parent = new_node
-				new_node.right = self.root
-				self.root.parent = new_node
-				self.update_heights(new_node)
-				new_node.parent = curr
-				curr.right = new_node
-				#self is the returned tree
-				self.root = tree2.root
-				self._size += tree2._size + 1
-
-
-			else: #tree2's keys are larger
-
-				curr = tree2.root 
-				#go left until we find the correct spot to insert new_node
-				while curr.left.height > self.root.height:
-					curr = curr.left
-				new_node.right = curr.left
-				if new_node.right.is_real_node():
-					new_node.right.parent = new_node
-				new_node.left = self.root
-				self.root.parent = new_node
-				self.update_heights(new_node)
-				new_node.parent = curr
-				curr.right = new_node
-				#self is the returned tree
-				self.root = tree2.root
-				self._size += tree2._size + 1
-
-			self.update_heights(new_node.parent)
-			#rebalancing from new_node
-			self.rebalance_after_insert(key, new_node)
+
+	"""joins self with another AVLTree, reusing a detached node as the separating item
+
+	@type tree2: AVLTree 
+	@param tree2: a dictionary to be joined with self
+	@type new_node: AVLNode
+	@param new_node: a real node that is not in any tree, its key separates self and tree2
+	@pre: all keys in self are smaller than new_node.key and all keys in tree2 are larger,
+	or the opposite way
+	"""
+	def join_node(self, tree2, new_node): #time complexity O(|height difference| + 1)
+		key = new_node.key
+		live = new_node.value is not TOMBSTONE #split_at and concat may use a marked node to join
+		new_node.parent = None
+		#find out which tree holds the smaller keys, an empty tree acts as a virtual root of height -1
+		if self.root is not None:
+			self_is_low = self.root.key < key
+		else:
+			self_is_low = tree2.root is None or tree2.root.key > key
+		low, high = (self, tree2) if self_is_low else (tree2, self)
+		low_root = low.root if low.root is not None else VIRTUAL
+		high_root = high.root if high.root is not None else VIRTUAL
+		#the fingers of the joined tree are the outer ends of the two trees
+		self._min_node = low._min_node if low.root is not None else new_node
+		self._max_node = high._max_node if high.root is not None else new_node
+		self._size = low._size + high._size + live
+		self._dead = low._dead + high._dead + (not live)
+
+		#start from the root of the taller tree and go down its inner spine until heights are equal,
+		#then put new_node there with the shorter tree as its other child
+		parent = None
+		if low_root.height >= high_root.height: #go down the right spine of low
+			curr = low_root
+			while curr.height > high_root.height:
+				parent = curr
+				curr = curr.right
+			new_node.left = curr
+			new_node.right = high_root
+			if parent is not None:
+				parent.right = new_node
+		else: #go down the left spine of high
+			curr = high_root
+			while curr.height > low_root.height:
+				parent = curr
+				curr = curr.left
+			new_node.left = low_root
+			new_node.right = curr
+			if parent is not None:
+				parent.left = new_node
+		if new_node.left.is_real_node():
+			new_node.left.parent = new_node
+		if new_node.right.is_real_node():
+			new_node.right.parent = new_node
+		new_node.height = 1 + max(new_node.left.height, new_node.right.height)
+		new_node.size = live + new_node.left.size + new_node.right.size
+		new_node.dead = (not live) + new_node.left.dead + new_node.right.dead
+		new_node.parent = parent
+		if parent is None:
+			self.root = new_node
 			return
+		self.root = low_root if low_root.height >= high_root.height else high_root
+		curr = parent
+		while curr is not None: #the spine above new_node holds the shorter tree now
+			curr.size = (curr.value is not TOMBSTONE) + curr.left.size + curr.right.size
+			curr.dead = (curr.value is TOMBSTONE) + curr.left.dead + curr.right.dead
+			curr = curr.parent
+		#rebalancing from new_node
+		self.rebalance_after_insert(key, new_node)
+		return
 
 
 	"""splits the dictionary at a given node
@@ -503,46 +1096,198 @@ class AVLTree(object):
 	dictionary larger than node.key.
 	"""
 	def split(self, node): #time complexity O(log n)
-    #split using join and delete recursively
-		return self.split_rec(self.root, node.key)
+		left, mid, right = self.split_key(node.key)
+		return left, right
 
-			
 
-	def split_rec(self, node, key): #time complexity O(log n)
-    #helper function for split
-		if not node.is_real_node():
-			return AVLTree(), AVLTree()
-		if node.key < key:
-			left, right = self.split_rec(node.right, key)
-			t_org_l = AVLTree()
-			t_org_l.root = node.left
-			if t_org_l.root:
-				t_org_l.root.parent = None
-			if node.is_real_node():
-				t_org_l.join(left, node.key, node.value)
-			return t_org_l, right
-		elif node.key > key:
-			left, right = self.split_rec(node.left, key)
-			t_org_r = AVLTree()
-			t_org_r.root = node.right
-			if t_org_r.root:
-				t_org_r.root.parent = None
-			if node.is_real_node():
-				t_org_r.join(right, node.key, node.value)
-			return left, t_org_r
-		else: #node.key == key
-			tree_small = AVLTree()
-			tree_small.root = node.left
-			if node.left:
-				node.left.parent = None
-				pass
-			tree_big = AVLTree()
-			tree_big.root = node.right
-			if node.right:
-				node.right.parent = None
-				pass
-			return tree_small, tree_big
-	
+	"""splits the dictionary at a key, which does not have to be in it
+
+	@type key: int
+	@param key: the key to split at
+	@rtype: (AVLTree, AVLNode, AVLTree)
+	@returns: a tuple (left, mid, right), where left holds the keys smaller than key, right holds
+	the keys larger than key and mid is the detached node of key, or None if key is not in the
+	dictionary. self is left empty, its nodes are reused by left and right
+	"""
+	def split_key(self, key): #time complexity O(log n)
+		left, mid, right = self.split_at(self.root if self.root is not None else VIRTUAL, key)
+		left.reset_fingers() #the subtrees glued together inside split_at carry no fingers
+		right.reset_fingers()
+		self.root = None
+		self._size = 0
+		self._dead = 0
+		self.reset_fingers()
+		return left, mid, right
+
+
+	def split_at(self, node, key): #time complexity O(log n), the join heights telescope
+    #helper function for split_key, returns (left, mid, right) for the subtree of node, where
+    #mid is the node of key or None. The path down to key is walked once, then the pieces hanging
+    #off it are joined bottom up into left and right, reusing every node on the path as a
+    #separator and one scratch AVLTree for the piece being joined, so only three trees are made
+		path = []
+		mid = None
+		while node.is_real_node():
+			if key == node.key:
+				mid = node
+				break
+			path.append(node)
+			node = node.left if key < node.key else node.right
+		if mid is not None:
+			left = self.detach_subtree(mid.left)
+			right = self.detach_subtree(mid.right)
+			mid.left = VIRTUAL
+			mid.right = VIRTUAL
+			mid.parent = None
+			mid.height = 0
+			mid.size = 1
+			mid.dead = 0
+		else:
+			left = AVLTree(self.stats, self.multiset, self.lazy_threshold)
+			right = AVLTree(self.stats, self.multiset, self.lazy_threshold)
+		piece = AVLTree(self.stats, self.multiset, self.lazy_threshold)
+		if mid is not None and mid.value is TOMBSTONE: #a marked node of key is dropped
+			mid = None
+		for node in reversed(path): #every earlier piece sits deeper, so it is no taller than this one
+			if node.key < key: #node and its left subtree are smaller than everything in left
+				sub = node.left
+				target = left
+			else:
+				sub = node.right
+				target = right
+			if sub.is_real_node():
+				sub.parent = None
+				piece.root = sub
+				piece._size = sub.size
+				piece._dead = sub.dead
+			else:
+				piece.root = None
+				piece._size = 0
+				piece._dead = 0
+			target.join_node(piece, node)
+		return left, mid, right
+
+
+	def detach_subtree(self, node): #time complexity O(1)
+    #wraps the subtree of node in a new AVLTree of the same kind, the fingers are left unset
+		tree = AVLTree(self.stats, self.multiset, self.lazy_threshold)
+		if node.is_real_node():
+			node.parent = None
+			tree.root = node
+			tree._size = node.size
+			tree._dead = node.dead
+		return tree
+
+
+	"""replaces self with the union of self and tree2
+
+	@type tree2: AVLTree
+	@param tree2: a dictionary, it is emptied since its nodes are moved into self
+	@post: keys in both dictionaries keep their node and value from self
+	"""
+	def union(self, tree2): #time complexity O(m log(n/m + 1)) for sizes m <= n
+		self.set_operation(tree2, self.union_rec)
+
+
+	"""replaces self with the intersection of self and tree2
+
+	@type tree2: AVLTree
+	@param tree2: a dictionary, it is emptied
+	@post: the remaining items keep their node and value from self
+	"""
+	def intersection(self, tree2): #time complexity O(m log(n/m + 1)) for sizes m <= n
+		self.set_operation(tree2, self.intersection_rec)
+
+
+	"""removes from self every key that appears in tree2
+
+	@type tree2: AVLTree
+	@param tree2: a dictionary, it is emptied
+	"""
+	def difference(self, tree2): #time complexity O(m log(n/m + 1)) for sizes m <= n
+		self.set_operation(tree2, self.difference_rec)
+
+
+	def set_operation(self, tree2, rec): #time complexity as rec
+    #helper for union, intersection and difference, moves the result into self
+		t1 = self.detach_subtree(self.root if self.root is not None else VIRTUAL)
+		t2 = self.detach_subtree(tree2.root if tree2.root is not None else VIRTUAL)
+		tree2.root = None
+		tree2._size = 0
+		tree2.reset_fingers()
+		tree2._dead = 0
+		res = rec(t1, t2, True)
+		self.root = res.root
+		self._size = res._size
+		self._dead = res._dead
+		self.reset_fingers()
+
+
+	def union_rec(self, t1, t2, first): #time complexity O(m log(n/m + 1))
+    #split the smaller tree by the root of the bigger one and recurse on both sides,
+    #first tells whether t1 holds the values of self
+		if t1._size < t2._size or t1.root is None: #a tree of marked nodes only has size 0 but a root
+			t1, t2, first = t2, t1, not first
+		if t2.root is None:
+			return t1
+		root = t1.root
+		l1 = self.detach_subtree(root.left)
+		r1 = self.detach_subtree(root.right)
+		l2, dup, r2 = t2.split_at(t2.root, root.key)
+		if dup is not None and (not first or root.value is TOMBSTONE): #the node of self wins, if it is live
+			root = dup
+		left = self.union_rec(l1, l2, first)
+		right = self.union_rec(r1, r2, first)
+		left.join_node(right, root)
+		return left
+
+
+	def intersection_rec(self, t1, t2, first): #time complexity O(m log(n/m + 1))
+		if t1._size < t2._size or t1.root is None: #a tree of marked nodes only has size 0 but a root
+			t1, t2, first = t2, t1, not first
+		if t2.root is None:
+			return t2
+		root = t1.root
+		l1 = self.detach_subtree(root.left)
+		r1 = self.detach_subtree(root.right)
+		l2, dup, r2 = t2.split_at(t2.root, root.key)
+		left = self.intersection_rec(l1, l2, first)
+		right = self.intersection_rec(r1, r2, first)
+		if dup is None or root.value is TOMBSTONE: #split_at never returns a marked node as dup
+			return self.concat(left, right)
+		if not first: #the node of self wins
+			root = dup
+		left.join_node(right, root)
+		return left
+
+
+	def difference_rec(self, t1, t2, first): #time complexity O(m log(n/m + 1))
+    #t1 always holds the keys of self here, so first is unused
+		if t1.root is None or t2.root is None:
+			return t1
+		root = t1.root
+		l1 = self.detach_subtree(root.left)
+		r1 = self.detach_subtree(root.right)
+		l2, dup, r2 = t2.split_at(t2.root, root.key)
+		left = self.difference_rec(l1, l2, first)
+		right = self.difference_rec(r1, r2, first)
+		if dup is not None or root.value is TOMBSTONE:
+			return self.concat(left, right)
+		left.join_node(right, root)
+		return left
+
+
+	def concat(self, left, right): #time complexity O(log n)
+    #joins two trees without a separating item: the max of left is cut out and used as one
+		if left.root is None:
+			return right
+		sep = left.root
+		while sep.right.is_real_node():
+			sep = sep.right
+		left.delete_node(sep) #really cut out, even from a lazy tree
+		left.join_node(right, sep)
+		return left
+
 
 	def successor(self, node): #time complexity O(log n)
 		if node.right.is_real_node(): #go right once and then left until we reach the min
@@ -556,23 +1301,305 @@ class AVLTree(object):
 		return curr.parent #could be None if no successor exists
 
 
+	def predecessor(self, node): #time complexity O(log n)
+    #mirror image of successor
+		if node.left.is_real_node(): #go left once and then right until we reach the max
+			curr = node.left
+			while curr.right.is_real_node():
+				curr = curr.right
+			return curr
+		curr = node
+		while curr.parent is not None and curr.parent.left == curr: #go up until we find a parent that is a right child
+			curr = curr.parent
+		return curr.parent #could be None if no predecessor exists
+
+
+	"""drops the lazily deleted nodes, relinking the live ones into a perfectly balanced tree.
+	delete calls it once the share of deleted nodes passes lazy_threshold
+
+	@post: every live node stays the same object with the same key and value
+	"""
+	def rebuild(self): #time complexity O(n)
+    #in-order walk with a stack, since the links of the deleted nodes are cut on the way:
+    #nothing points at them afterwards, so they are freed at once instead of by the cycle collector
+		nodes = []
+		stack = []
+		curr = self.root if self.root is not None else VIRTUAL
+		while stack or curr.is_real_node():
+			while curr.is_real_node():
+				stack.append(curr)
+				curr = curr.left
+			curr = stack.pop()
+			right = curr.right
+			if curr.value is TOMBSTONE:
+				curr.parent = None
+				curr.left = VIRTUAL
+				curr.right = VIRTUAL
+			else:
+				nodes.append(curr)
+			curr = right
+		root = self.link_balanced(nodes, 0, len(nodes), None)
+		self.root = root if root.is_real_node() else None
+		self._size = len(nodes)
+		self._dead = 0
+		self.reset_fingers()
+
+
+	def link_balanced(self, nodes, lo, hi, parent): #time complexity O(hi - lo)
+    #helping func for rebuild, hangs nodes[lo:hi] below parent split at the middle,
+    #so the two sides of every node differ by at most one node and one level
+		if lo >= hi:
+			return VIRTUAL
+		mid = (lo + hi) // 2
+		node = nodes[mid]
+		node.parent = parent
+		node.left = self.link_balanced(nodes, lo, mid, node)
+		node.right = self.link_balanced(nodes, mid + 1, hi, node)
+		node.height = 1 + max(node.left.height, node.right.height)
+		node.size = hi - lo
+		node.dead = 0
+		return node
+
+
+	def reset_fingers(self): #time complexity O(log n)
+    #recompute the min and max fingers by walking down both spines
+		if self.root is None:
+			self._min_node = None
+			self._max_node = None
+			return
+		curr = self.root
+		while curr.left.is_real_node():
+			curr = curr.left
+		self._min_node = curr
+		curr = self.root
+		while curr.right.is_real_node():
+			curr = curr.right
+		self._max_node = curr
+		if self._dead: #the ends may be marked nodes
+			self.drop_dead_fingers()
+
+
+	"""returns the number of keys in the dictionary that are smaller than key
+
+	@type key: int
+	@param key: a key, it does not have to appear in the dictionary
+	@rtype: int
+	@returns: the number of keys smaller than key, which is the 0-based position of key if it appears
+	"""
+	def rank(self, key): #time complexity O(log n)
+		return self.count_smaller(key, False)
+
+
+	def count_smaller(self, key, inclusive): #time complexity O(log n)
+    #helping func for rank and count_range, counts keys < key (or <= key when inclusive)
+		count = 0
+		curr = self.root if self.root is not None else VIRTUAL
+		while curr.is_real_node():
+			if key > curr.key or (inclusive and key == curr.key):
+				count += curr.left.size + (curr.value is not TOMBSTONE)
+				curr = curr.right
+			elif key < curr.key:
+				curr = curr.left
+			else: #key == curr.key, not inclusive
+				return count + curr.left.size
+		return count
+
+
+	"""returns the node holding the i-th smallest key in the dictionary
+
+	@type i: int
+	@param i: a 0-based position, select(rank(key)) is the node of key
+	@rtype: AVLNode
+	@returns: the node at position i, None if i is not between 0 and size()-1
+	"""
+	def select(self, i): #time complexity O(log n)
+		if i < 0 or i >= self._size:
+			return None
+		curr = self.root
+		while True:
+			left_size = curr.left.size
+			live = curr.value is not TOMBSTONE #a marked node is not counted in the sizes
+			if i < left_size:
+				curr = curr.left
+			elif i == left_size and live:
+				return curr
+			else:
+				i -= left_size + live
+				curr = curr.right
+
+
+	"""returns the number of keys between lo and hi
+
+	@type lo: int
+	@param lo: lower end of the range (inclusive)
+	@type hi: int
+	@param hi: upper end of the range (inclusive)
+	@rtype: int
+	@returns: the number of keys k in the dictionary with lo <= k <= hi
+	"""
+	def count_range(self, lo, hi): #time complexity O(log n)
+		if lo > hi:
+			return 0
+		return self.count_smaller(hi, True) - self.count_smaller(lo, False)
+
+
+	"""returns the node with the smallest key that is at least key
+
+	@type key: int
+	@param key: a key, it does not have to appear in the dictionary
+	@rtype: AVLNode
+	@returns: the node, None if all keys are smaller than key
+	"""
+	def ceiling(self, key): #time complexity O(log n)
+		if self._dead: #a marked node cannot be the answer, so count the live keys instead
+			return self.select(self.count_smaller(key, False))
+		found = None
+		curr = self.root if self.root is not None else VIRTUAL
+		while curr.is_real_node():
+			if curr.key < key:
+				curr = curr.right
+			else: #curr is a candidate, look for a smaller one on the left
+				found = curr
+				if curr.key == key:
+					break
+				curr = curr.left
+		return found
+
+
+	"""returns the node with the largest key that is at most key
+
+	@type key: int
+	@param key: a key, it does not have to appear in the dictionary
+	@rtype: AVLNode
+	@returns: the node, None if all keys are larger than key
+	"""
+	def floor(self, key): #time complexity O(log n)
+		if self._dead:
+			return self.select(self.count_smaller(key, True) - 1)
+		found = None
+		curr = self.root if self.root is not None else VIRTUAL
+		while curr.is_real_node():
+			if curr.key > key:
+				curr = curr.left
+			else: #curr is a candidate, look for a larger one on the right
+				found = curr
+				if curr.key == key:
+					break
+				curr = curr.right
+		return found
+
+
+	"""lazily yields the items with lo <= key <= hi in sorted order
+
+	@type lo: int
+	@param lo: lower end of the range (inclusive)
+	@type hi: int
+	@param hi: upper end of the range (inclusive)
+	@type reverse: bool
+	@param reverse: yield from hi down to lo instead
+	@pre: the dictionary is not changed while the generator is in use
+	@rtype: generator
+	@returns: a generator of touples (key, value)
+	"""
+	def range(self, lo, hi, reverse=False): #time complexity O(log n + k) for k items and the marked nodes between them, O(1) extra memory
+		if not reverse:
+			curr = self.ceiling(lo)
+			while curr is not None and curr.key <= hi:
+				if curr.value is not TOMBSTONE: #lazily deleted nodes are skipped
+					yield curr.key, curr.value
+				curr = self.successor(curr)
+		else:
+			curr = self.floor(hi)
+			while curr is not None and curr.key >= lo:
+				if curr.value is not TOMBSTONE:
+					yield curr.key, curr.value
+				curr = self.predecessor(curr)
+
+
+	"""yields the nodes of the dictionary in sorted order, following parent pointers
+
+	@type reverse: bool
+	@param reverse: yield from the max down to the min instead
+	@pre: the dictionary is not changed while the generator is in use
+	@rtype: generator
+	@returns: a generator of AVLNode
+	"""
+	def iter_nodes(self, reverse=False): #time complexity O(n) in total, O(1) extra memory
+    #successor/predecessor written inline, every edge is crossed at most twice
+		if not reverse:
+			curr = self._min_node
+			while curr is not None:
+				if curr.value is not TOMBSTONE: #lazily deleted nodes are skipped
+					yield curr
+				if not curr.right.is_virtual: #go right once and then left until we reach the min
+					curr = curr.right
+					while not curr.left.is_virtual:
+						curr = curr.left
+				else: #go up until we come from a left child
+					while curr.parent is not None and curr.parent.right is curr:
+						curr = curr.parent
+					curr = curr.parent
+		else:
+			curr = self._max_node
+			while curr is not None:
+				if curr.value is not TOMBSTONE:
+					yield curr
+				if not curr.left.is_virtual:
+					curr = curr.left
+					while not curr.right.is_virtual:
+						curr = curr.right
+				else:
+					while curr.parent is not None and curr.parent.left is curr:
+						curr = curr.parent
+					curr = curr.parent
+
+
+	def __iter__(self): #time complexity O(n), O(total count) in a multiset
+		if self.multiset:
+			return self.iter_copies(False)
+		return self.keys()
+
+
+	def __reversed__(self): #time complexity O(n), O(total count) in a multiset
+		if self.multiset:
+			return self.iter_copies(True)
+		return (node.key for node in self.iter_nodes(True))
+
+
+	def iter_copies(self, reverse): #time complexity O(total count)
+    #every key repeated by its count, for a multiset tree
+		for node in self.iter_nodes(reverse):
+			for i in range(node.value):
+				yield node.key
+
+
+	"""returns the keys of the dictionary in sorted order
+
+	@rtype: generator
+	@returns: a generator of keys, each key once in a multiset too
+	"""
+	def keys(self): #time complexity O(n)
+		for node in self.iter_nodes():
+			yield node.key
+
+
+	"""returns the items of the dictionary in sorted order
+
+	@rtype: generator
+	@returns: a generator of touples (key, value), (key, count) in a multiset
+	"""
+	def items(self): #time complexity O(n)
+		for node in self.iter_nodes():
+			yield node.key, node.value
+
+
 	"""returns an array representing dictionary 
 
 	@rtype: list
 	@returns: a sorted list according to key of touples (key, value) representing the data structure
 	"""
 	def avl_to_array(self): #time complexity O(n)
-    #recursive inorder traversal
-		if self.root is None: #check if tree is empty
-			return []
-		res = []
-		def inorder(curr): #inorder traversal
-			if curr.is_real_node():
-				inorder(curr.left)
-				res.append((curr.key, curr.value))
-				inorder(curr.right)
-		inorder(self.root)
-		return res
+		return [(node.key, node.value) for node in self.iter_nodes()]
 
 
 	"""returns the node with the maximal key in the dictionary
@@ -580,13 +1607,17 @@ class AVLTree(object):
 	@rtype: AVLNode
 	@returns: the maximal node, None if the dictionary is empty
 	"""
-	def max_node(self): #time complexity O(log n)
-		if self.root is None: #check if tree is empty
-			return None
-		curr = self.root
-		while curr.right.is_real_node(): #go right until we reach the max
-			curr = curr.right
-		return curr
+	def max_node(self): #time complexity O(1)
+		return self._max_node #None if empty
+
+
+	"""returns the node with the minimal key in the dictionary
+
+	@rtype: AVLNode
+	@returns: the minimal node, None if the dictionary is empty
+	"""
+	def min_node(self): #time complexity O(1)
+		return self._min_node #None if empty
 
 
 	"""returns the number of items in dictionary 
@@ -595,8 +1626,8 @@ class AVLTree(object):
 	@returns: the number of items in dictionary 
 	"""
 	def size(self): #time complexity O(1)
-    #simple
-		return self._size	
+    #simple, lazily deleted nodes are not items
+		return self._size
 
 
 	"""returns the root of the tree representing the dictionary
@@ -0,0 +1,245 @@
+#id1: 316175827
+#name1: Maayan Oz
+#username1: maayanoz
+#id2: 211627658
+#name2: Amir Arbiv
+#username2: amirarbiv1
+
+
+"""A thread-safe wrapper around AVLTree.
+
+Readers share the tree, writers get it alone. A rotation in rotate_left or
+rotate_right therefore never runs while a search is walking the same nodes.
+Waiting writers block new readers, so a steady stream of reads cannot starve
+the ingester.
+
+The wrapper takes and returns keys and values, never nodes: AVLTree.delete
+copies the successor into a node with two children, so a node handle kept
+outside the lock could silently start holding another item.
+"""
+
+import threading
+from AVLTree import AVLTree
+
+
+"""
+A readers-writer lock that prefers writers.
+"""
+
+class RWLock(object):
+
+	def __init__(self):
+		self._cond = threading.Condition(threading.Lock())
+		self._readers = 0 #readers inside
+		self._writer = False #a writer is inside
+		self._waiting_writers = 0
+
+
+	def acquire_read(self):
+		with self._cond:
+			while self._writer or self._waiting_writers:
+				self._cond.wait()
+			self._readers += 1
+
+
+	def release_read(self):
+		with self._cond:
+			self._readers -= 1
+			if self._readers == 0:
+				self._cond.notify_all()
+
+
+	def acquire_write(self):
+		with self._cond:
+			self._waiting_writers += 1
+			while self._writer or self._readers:
+				self._cond.wait()
+			self._waiting_writers -= 1
+			self._writer = True
+
+
+	def release_write(self):
+		with self._cond:
+			self._writer = False
+			self._cond.notify_all()
+
+
+	def read_locked(self):
+		return _Held(self.acquire_read, self.release_read)
+
+
+	def write_locked(self):
+		return _Held(self.acquire_write, self.release_write)
+
+
+class _Held(object):
+    #context manager for one side of an RWLock
+	__slots__ = ("_enter", "_exit")
+
+	def __init__(self, enter, exit):
+		self._enter = enter
+		self._exit = exit
+
+	def __enter__(self):
+		self._enter()
+
+	def __exit__(self, *exc):
+		self._exit()
+		return False
+
+
+"""
+A class wrapping an AVLTree so that it can be shared between threads.
+"""
+
+class ConcurrentAVLTree(object):
+
+	"""
+	Constructor.
+
+	@type tree: AVLTree
+	@param tree: the tree to share, a new empty tree if None.
+	It must not be used directly anymore, only through the wrapper.
+	"""
+	def __init__(self, tree=None):
+		self.tree = tree if tree is not None else AVLTree()
+		self.lock = RWLock()
+
+
+	"""searches for key, see AVLTree.search
+
+	@type key: int
+	@param key: a key to be searched
+	@rtype: (int, string)
+	@returns: a touple (key, value) copied under the read lock, or None if key does not appear
+	"""
+	def search(self, key): #time complexity O(log n)
+		with self.lock.read_locked():
+			node = self.tree.search(key)[0]
+			return (node.key, node.value) if node is not None else None
+
+
+	"""searches for key starting at the max, see AVLTree.finger_search
+
+	@rtype: (int, string)
+	@returns: a touple (key, value) copied under the read lock, or None if key does not appear
+	"""
+	def finger_search(self, key): #time complexity O(log n)
+		with self.lock.read_locked():
+			node = self.tree.finger_search(key)[0]
+			return (node.key, node.value) if node is not None else None
+
+
+	"""returns the value of key, or default if key does not appear
+
+	@type key: int
+	@param key: a key to be searched
+	@returns: the value, read under the same lock as the search
+	"""
+	def get(self, key, default=None): #time complexity O(log n)
+		with self.lock.read_locked():
+			node = self.tree.search(key)[0]
+			return node.value if node is not None else default
+
+
+	"""returns the items with lo <= key <= hi, see AVLTree.range
+
+	@rtype: list
+	@returns: a list of touples (key, value), collected under one read lock so it is consistent
+	"""
+	def range(self, lo, hi, reverse=False): #time complexity O(log n + k)
+		with self.lock.read_locked():
+			return list(self.tree.range(lo, hi, reverse))
+
+
+	"""returns an array representing dictionary, see AVLTree.avl_to_array"""
+	def avl_to_array(self): #time complexity O(n)
+		with self.lock.read_locked():
+			return self.tree.avl_to_array()
+
+
+	"""inserts a new item, see AVLTree.insert
+
+	@pre: key currently does not appear in the dictionary, use insert_if_absent or upsert
+	when another thread may have inserted it
+	@rtype: (int, int)
+	@returns: a touple (e, h) as in AVLTree.insert, without the node
+	"""
+	def insert(self, key, val): #time complexity O(log n)
+		with self.lock.write_locked():
+			return self.tree.insert(key, val)[1:]
+
+
+	"""inserts a new item starting at the max, see AVLTree.finger_insert
+
+	@pre: key currently does not appear in the dictionary
+	@rtype: (int, int)
+	@returns: a touple (e, h) as in AVLTree.finger_insert, without the node
+	"""
+	def finger_insert(self, key, val): #time complexity O(log n)
+		with self.lock.write_locked():
+			return self.tree.finger_insert(key, val)[1:]
+
+
+	"""inserts an item unless key is already there, checking and inserting under one write lock
+
+	@type key: int
+	@param key: key of the item to insert
+	@type val: string
+	@param val: the value of the item
+	@rtype: bool
+	@returns: True if the item was inserted, False if key was there and nothing changed
+	"""
+	def insert_if_absent(self, key, val): #time complexity O(log n)
+		with self.lock.write_locked():
+			if self.tree.search(key)[0] is not None:
+				return False
+			self.tree.insert(key, val)
+			return True
+
+
+	"""sets the value of key, inserting a new item if key is not there, under one write lock
+
+	@type key: int
+	@param key: key of the item
+	@type val: string
+	@param val: the new value
+	@rtype: bool
+	@returns: True if a new item was inserted, False if the value of an existing one was replaced
+	"""
+	def upsert(self, key, val): #time complexity O(log n)
+		with self.lock.write_locked():
+			node = self.tree.search(key)[0]
+			if node is not None:
+				node.value = val
+				return False
+			self.tree.insert(key, val)
+			return True
+
+
+	"""deletes the node of key, searching and deleting under one write lock
+
+	@type key: int
+	@param key: key of the item to delete
+	@rtype: bool
+	@returns: True if key was found and deleted
+	"""
+	def delete_key(self, key): #time complexity O(log n)
+		with self.lock.write_locked():
+			node = self.tree.search(key)[0]
+			if node is None:
+				return False
+			self.tree.delete(node)
+			return True
+
+
+	"""deletes all items with lo <= key <= hi under one write lock, see AVLTree.delete_range"""
+	def delete_range(self, lo, hi, return_tree=False): #time complexity O(log n)
+		with self.lock.write_locked():
+			return self.tree.delete_range(lo, hi, return_tree)
+
+
+	"""returns the number of items in dictionary"""
+	def size(self): #time complexity O(1)
+		with self.lock.read_locked():
+			return self.tree.size()
@@ -0,0 +1,293 @@
+#id1: 316175827
+#name1: Maayan Oz
+#username1: maayanoz
+#id2: 211627658
+#name2: Amir Arbiv
+#username2: amirarbiv1
+
+
+"""A persistent AVL tree: every update path-copies and returns a new version.
+
+Nodes are never changed once a version that contains them exists, so any
+number of versions share all the nodes off the copied paths, and holding on
+to a version is a consistent snapshot for free. Unlike AVLTree the nodes have
+no parent pointer, since a copied node would otherwise have to re-point the
+parent of both its children, and those children are shared with older versions.
+"""
+
+
+"""A class represnting a node in a persistent AVL tree, a missing child is None"""
+
+class PAVLNode(object):
+	__slots__ = ("key", "value", "left", "right", "height", "size")
+
+	def __init__(self, key, value, left, right):
+		self.key = key
+		self.value = value
+		self.left = left
+		self.right = right
+		hl = left.height if left is not None else -1
+		hr = right.height if right is not None else -1
+		self.height = 1 + (hl if hl > hr else hr)
+		self.size = 1 + (left.size if left is not None else 0) + (right.size if right is not None else 0)
+
+
+def height(node): #time complexity O(1)
+	return node.height if node is not None else -1
+
+
+def balanced(key, value, left, right): #time complexity O(1)
+    #builds a node over left and right, with one (or a double) rotation if they differ by 2
+	hl = height(left)
+	hr = height(right)
+	if hl > hr + 1: #left heavy
+		if height(left.left) >= height(left.right): #left-left case
+			return PAVLNode(left.key, left.value, left.left, PAVLNode(key, value, left.right, right))
+		lr = left.right #left-right case
+		return PAVLNode(lr.key, lr.value, PAVLNode(left.key, left.value, left.left, lr.left),
+			PAVLNode(key, value, lr.right, right))
+	if hr > hl + 1: #right heavy
+		if height(right.right) >= height(right.left): #right-right case
+			return PAVLNode(right.key, right.value, PAVLNode(key, value, left, right.left), right.right)
+		rl = right.left #right-left case
+		return PAVLNode(rl.key, rl.value, PAVLNode(key, value, left, rl.left),
+			PAVLNode(right.key, right.value, rl.right, right.right))
+	return PAVLNode(key, value, left, right)
+
+
+def insert_rec(node, key, val): #time complexity O(log n)
+	if node is None:
+		return PAVLNode(key, val, None, None)
+	if key < node.key:
+		return balanced(node.key, node.value, insert_rec(node.left, key, val), node.right)
+	if key > node.key:
+		return balanced(node.key, node.value, node.left, insert_rec(node.right, key, val))
+	return PAVLNode(key, val, node.left, node.right) #key exists, replace its value
+
+
+def delete_min_rec(node): #time complexity O(log n)
+    #returns (min node, subtree without it)
+	if node.left is None:
+		return node, node.right
+	(mn, rest) = delete_min_rec(node.left)
+	return mn, balanced(node.key, node.value, rest, node.right)
+
+
+def delete_rec(node, key): #time complexity O(log n)
+	if node is None:
+		return None
+	if key < node.key:
+		return balanced(node.key, node.value, delete_rec(node.left, key), node.right)
+	if key > node.key:
+		return balanced(node.key, node.value, node.left, delete_rec(node.right, key))
+	if node.left is None:
+		return node.right
+	if node.right is None:
+		return node.left
+	(succ, rest) = delete_min_rec(node.right)
+	return balanced(succ.key, succ.value, node.left, rest)
+
+
+def join_rec(left, key, val, right): #time complexity O(|height difference| + 1)
+    #go down the inner spine of the taller side until heights match, copying only that spine
+	hl = height(left)
+	hr = height(right)
+	if hl > hr + 1:
+		return balanced(left.key, left.value, left.left, join_rec(left.right, key, val, right))
+	if hr > hl + 1:
+		return balanced(right.key, right.value, join_rec(left, key, val, right.left), right.right)
+	return PAVLNode(key, val, left, right)
+
+
+def split_rec(node, key): #time complexity O(log n), the join heights telescope
+    #returns (left, node of key or None, right)
+	if node is None:
+		return None, None, None
+	if key < node.key:
+		(l, mid, r) = split_rec(node.left, key)
+		return l, mid, join_rec(r, node.key, node.value, node.right)
+	if key > node.key:
+		(l, mid, r) = split_rec(node.right, key)
+		return join_rec(node.left, node.key, node.value, l), mid, r
+	return node.left, node, node.right
+
+
+"""
+A class implementing one version of a persistent AVL tree.
+"""
+
+class PersistentAVLTree(object):
+
+	"""
+	Constructor, the empty version unless a root is given.
+
+	@type root: PAVLNode
+	@param root: the root of an existing version, or None
+	"""
+	def __init__(self, root=None):
+		self.root = root
+
+
+	"""builds a balanced version from items given in increasing key order
+
+	@type items: iterable
+	@pre: the keys of items are strictly increasing
+	@param items: (key, value) pairs, for example AVLTree.items()
+	@rtype: PersistentAVLTree
+	"""
+	@classmethod
+	def from_sorted(cls, items): #time complexity O(n)
+		items = list(items)
+
+		def build(lo, hi): #builds items[lo:hi]
+			if lo >= hi:
+				return None
+			mid = (lo + hi) // 2
+			return PAVLNode(items[mid][0], items[mid][1], build(lo, mid), build(mid + 1, hi))
+
+		return cls(build(0, len(items)))
+
+
+	"""returns a read-only snapshot of the current version
+
+	@rtype: PersistentAVLTree
+	@returns: self, versions are never changed in place
+	"""
+	def snapshot(self): #time complexity O(1)
+		return self
+
+
+	"""searches for a node in the dictionary corresponding to the key (starting at the root)
+
+	@type key: int
+	@param key: a key to be searched
+	@rtype: (PAVLNode,int)
+	@returns: a tuple (x,e) where x is the node corresponding to key (or None if not found),
+	and e is the number of edges on the path between the starting node and ending node+1.
+	"""
+	def search(self, key): #time complexity O(log n)
+		count = 0
+		curr = self.root
+		while curr is not None:
+			if key == curr.key:
+				return curr, count+1
+			curr = curr.right if key > curr.key else curr.left
+			count += 1
+		return None, -1
+
+
+	"""returns a new version with key inserted, or with its value replaced if key exists
+
+	@type key: int
+	@param key: key of item that is to be inserted
+	@type val: string
+	@param val: the value of the item
+	@rtype: PersistentAVLTree
+	@returns: the new version, self is unchanged
+	"""
+	def insert(self, key, val): #time complexity O(log n), copies O(log n) nodes
+		return PersistentAVLTree(insert_rec(self.root, key, val))
+
+
+	"""returns a new version without key
+
+	@type key: int
+	@param key: key of item that is to be deleted, nothing changes if it does not appear
+	@rtype: PersistentAVLTree
+	@returns: the new version, self is unchanged
+	"""
+	def delete(self, key): #time complexity O(log n), copies O(log n) nodes
+		return PersistentAVLTree(delete_rec(self.root, key))
+
+
+	"""returns a new version holding self, the item and tree2
+
+	@type tree2: PersistentAVLTree
+	@param tree2: a version to be joined with self, it is unchanged
+	@type key: int
+	@param key: the key separting self and tree2
+	@type val: string
+	@param val: the value corresponding to key
+	@pre: all keys in self are smaller than key and all keys in tree2 are larger than key,
+	or the opposite way
+	@rtype: PersistentAVLTree
+	"""
+	def join(self, tree2, key, val): #time complexity O(log n)
+		if (self.root is not None and self.root.key > key) or (tree2.root is not None and tree2.root.key < key):
+			return PersistentAVLTree(join_rec(tree2.root, key, val, self.root)) #tree2 holds the smaller keys
+		return PersistentAVLTree(join_rec(self.root, key, val, tree2.root))
+
+
+	"""splits the dictionary at a key
+
+	@type key: int
+	@param key: the key to split at, it does not have to appear
+	@rtype: (PersistentAVLTree, PersistentAVLTree)
+	@returns: a tuple (left, right) of new versions with the keys smaller and larger than key,
+	self is unchanged
+	"""
+	def split(self, key): #time complexity O(log n)
+		(left, mid, right) = split_rec(self.root, key)
+		return PersistentAVLTree(left), PersistentAVLTree(right)
+
+
+	"""returns the items of the dictionary in sorted order
+
+	@rtype: generator
+	@returns: a generator of touples (key, value)
+	"""
+	def items(self): #time complexity O(n), O(log n) extra memory
+    #there are no parent pointers, so the path back up is kept on a stack
+		stack = []
+		curr = self.root
+		while stack or curr is not None:
+			while curr is not None:
+				stack.append(curr)
+				curr = curr.left
+			curr = stack.pop()
+			yield curr.key, curr.value
+			curr = curr.right
+
+
+	def __iter__(self): #time complexity O(n)
+		for key, val in self.items():
+			yield key
+
+
+	"""returns an array representing dictionary
+
+	@rtype: list
+	@returns: a sorted list according to key of touples (key, value) representing the data structure
+	"""
+	def avl_to_array(self): #time complexity O(n)
+		return list(self.items())
+
+
+	"""returns the node with the maximal key in the dictionary
+
+	@rtype: PAVLNode
+	@returns: the maximal node, None if the dictionary is empty
+	"""
+	def max_node(self): #time complexity O(log n)
+		curr = self.root
+		while curr is not None and curr.right is not None:
+			curr = curr.right
+		return curr
+
+
+	"""returns the number of items in dictionary
+
+	@rtype: int
+	@returns: the number of items in dictionary
+	"""
+	def size(self): #time complexity O(1)
+		return self.root.size if self.root is not None else 0
+
+
+	"""returns the root of the tree representing the dictionary
+
+	@rtype: PAVLNode
+	@returns: the root, None if the dictionary is empty
+	"""
+	def get_root(self): #time complexity O(1)
+		return self.root
@@ -0,0 +1,69 @@
+'''
+    In order to run the benchmark:
+    1.  Make sure AVLTree.py, AVLArrayTree.py and this file
+        are all in the same directory.
+    2.  Run: python3 bench_array_engine.py [n]   (default n = 1000000)
+    3.  Memory, a full gc.collect() pause and the time of each
+        operation are printed for both engines.
+'''
+
+import gc
+import random
+import sys
+import time
+import tracemalloc
+from AVLTree import AVLTree
+from AVLArrayTree import AVLArrayTree
+
+
+def run(name, cls, keys):
+    n = len(keys)
+    row = {}
+
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    t = cls()
+    for k in keys:
+        t.insert(k, "")
+    row["bytes/key"] = (tracemalloc.get_traced_memory()[0] - before) / n
+    tracemalloc.stop()
+    del t
+    gc.collect()
+
+    start = time.perf_counter()
+    t = cls()
+    for k in keys:
+        t.insert(k, "")
+    row["insert ns/op"] = (time.perf_counter() - start) * 1e9 / n
+
+    start = time.perf_counter()
+    for k in keys:
+        t.search(k)
+    row["search ns/op"] = (time.perf_counter() - start) * 1e9 / n
+
+    start = time.perf_counter()
+    t.avl_to_array()
+    row["to_array ns/item"] = (time.perf_counter() - start) * 1e9 / n
+
+    start = time.perf_counter()
+    gc.collect()
+    row["gc.collect ms"] = (time.perf_counter() - start) * 1e3
+
+    half = keys[: n // 2]
+    start = time.perf_counter()
+    for k in half:
+        t.delete(t.search(k)[0])
+    row["delete ns/op"] = (time.perf_counter() - start) * 1e9 / len(half)
+
+    print(name)
+    for label, val in row.items():
+        print("  %-18s %10.1f" % (label, val))
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    random.seed(0)
+    keys = random.sample(range(10 * n), n)
+    print("n =", n)
+    run("AVLTree (objects)", AVLTree, keys)
+    run("AVLArrayTree (columns)", AVLArrayTree, keys)
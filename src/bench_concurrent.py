@@ -0,0 +1,75 @@
+'''
+    In order to run the benchmark:
+    1.  Make sure AVLTree.py, ConcurrentAVLTree.py and this file
+        are all in the same directory.
+    2.  Run: python3 bench_concurrent.py [threads] [seconds] [n]
+        (default 8 threads, 2 seconds per writer ratio, n = 100000)
+    3.  Reads/sec and writes/sec are printed for each writer ratio,
+        and the tree is checked to still be a valid AVL tree.
+'''
+
+import random
+import sys
+import threading
+import time
+from AVLTree import AVLTree
+from ConcurrentAVLTree import ConcurrentAVLTree
+
+
+def worker(tree, n, writer_ratio, stop, counts, seed):
+    rnd = random.Random(seed)
+    reads = writes = 0
+    while not stop.is_set():
+        key = rnd.randrange(2 * n)
+        if rnd.random() < writer_ratio:
+            # toggle the key, each half takes the write lock on its own
+            if not tree.insert_if_absent(key, ""):
+                tree.delete_key(key)
+            writes += 1
+        elif rnd.random() < 0.9:
+            tree.search(key)
+            reads += 1
+        else:
+            tree.range(key, key + 20)
+            reads += 1
+    counts.append((reads, writes))
+
+
+def valid(tree):
+    # heights, parents and order, checked without recursion
+    keys = tree.avl_to_array()
+    assert all(keys[i][0] < keys[i + 1][0] for i in range(len(keys) - 1))
+    stack = [tree.tree.root] if tree.tree.root is not None else []
+    while stack:
+        node = stack.pop()
+        for child in (node.left, node.right):
+            if child.is_real_node():
+                assert child.parent is node
+                stack.append(child)
+        assert abs(node.left.height - node.right.height) <= 1
+        assert node.height == 1 + max(node.left.height, node.right.height)
+    return len(keys) == tree.size()
+
+
+if __name__ == "__main__":
+    threads = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    seconds = float(sys.argv[2]) if len(sys.argv) > 2 else 2.0
+    n = int(sys.argv[3]) if len(sys.argv) > 3 else 100000
+
+    print("threads =", threads, " n =", n)
+    print("%-14s %14s %14s %8s" % ("writer ratio", "reads/sec", "writes/sec", "valid"))
+    for writer_ratio in (0.0, 0.01, 0.1, 0.5):
+        tree = ConcurrentAVLTree(AVLTree.from_sorted((k, "") for k in range(0, 2 * n, 2)))
+        stop = threading.Event()
+        counts = []
+        pool = [threading.Thread(target=worker, args=(tree, n, writer_ratio, stop, counts, i))
+                for i in range(threads)]
+        for t in pool:
+            t.start()
+        time.sleep(seconds)
+        stop.set()
+        for t in pool:
+            t.join()
+        reads = sum(c[0] for c in counts)
+        writes = sum(c[1] for c in counts)
+        print("%-14s %14.0f %14.0f %8s" % (writer_ratio, reads / seconds, writes / seconds, valid(tree)))
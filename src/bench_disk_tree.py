@@ -0,0 +1,70 @@
+'''
+    In order to run the benchmark:
+    1.  Make sure AVLTree.py, AVLArrayTree.py, AVLDiskTree.py and this
+        file are all in the same directory.
+    2.  Run: python3 bench_disk_tree.py [n] [lookups]
+        (default n = 2000000, lookups = 100000)
+    3.  Lookup latency of AVLDiskTree is printed for a cold page cache
+        (right after reopening, with the file evicted where the OS allows
+        it) and a warm one, next to the in-memory AVLTree.
+'''
+
+import os
+import random
+import sys
+import tempfile
+import time
+from AVLTree import AVLTree
+from AVLDiskTree import AVLDiskTree
+
+
+def drop_cache(path):
+    # asks the kernel to forget the cached pages of path, only where posix_fadvise exists
+    if not hasattr(os, "posix_fadvise"):
+        return False
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+    finally:
+        os.close(fd)
+    return True
+
+
+def lookup_ns(search, probes):
+    start = time.perf_counter()
+    for k in probes:
+        search(k)
+    return (time.perf_counter() - start) * 1e9 / len(probes)
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 2000000
+    lookups = int(sys.argv[2]) if len(sys.argv) > 2 else 100000
+    random.seed(0)
+    path = os.path.join(tempfile.mkdtemp(), "index.avl")
+    items = [(k, 10 * k) for k in range(0, 2 * n, 2)]
+    probes = [random.randrange(2 * n) for _ in range(lookups)]
+
+    start = time.perf_counter()
+    with AVLDiskTree(path, capacity=n + 1) as d:
+        for k, v in items:
+            d.finger_insert(k, v)  # increasing keys, each one goes next to the max
+    build_secs = time.perf_counter() - start
+
+    dropped = drop_cache(path)
+    with AVLDiskTree(path) as d:
+        cold = lookup_ns(d.search, probes)
+        warm = lookup_ns(d.search, probes)
+
+    t = AVLTree.from_sorted(items)
+    memory = lookup_ns(t.search, probes)
+
+    mb = os.path.getsize(path) / 1e6
+    os.remove(path)
+    print("keys:                      ", n)
+    print("file size (MB):            ", round(mb, 1))
+    print("disk build keys/s:         ", round(n / build_secs))
+    print("AVLDiskTree cold ns/search:", round(cold), "" if dropped else "(page cache not dropped)")
+    print("AVLDiskTree warm ns/search:", round(warm))
+    print("AVLTree ns/search:         ", round(memory))
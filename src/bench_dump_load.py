@@ -0,0 +1,56 @@
+'''
+    In order to run the benchmark:
+    1.  Make sure your AVLTree.py file and this file
+        are both in the same directory.
+    2.  Run: python3 bench_dump_load.py [n]   (default n = 5000000)
+    3.  Dump and load throughput are printed at the end, next to
+        rebuilding the same tree with n calls to insert.
+'''
+
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from AVLTree import AVLTree
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 5000000
+    t = AVLTree.from_sorted((k, "value-%d" % k) for k in range(n))
+    path = os.path.join(tempfile.mkdtemp(), "tree.avl")
+
+    start = time.perf_counter()
+    t.dump(path)
+    dump_secs = time.perf_counter() - start
+    mb = os.path.getsize(path) / 1e6
+    items = t.avl_to_array()
+    del t
+
+    start = time.perf_counter()
+    loaded = AVLTree.load(path)
+    load_secs = time.perf_counter() - start
+    assert loaded.size() == n
+    del loaded
+
+    # transient memory of a load: the peak above what the finished tree holds
+    tracemalloc.start()
+    loaded = AVLTree.load(path)
+    final, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del loaded
+
+    inserted = AVLTree()
+    start = time.perf_counter()
+    for k, v in items:
+        inserted.insert(k, v)
+    insert_secs = time.perf_counter() - start
+
+    os.remove(path)
+    print("keys:                 ", n)
+    print("file size (MB):       ", round(mb, 1))
+    print("dump MB/s:            ", round(mb / dump_secs, 1))
+    print("load MB/s:            ", round(mb / load_secs, 1))
+    print("load keys/s:          ", round(n / load_secs))
+    print("load overhead (KB):   ", round((peak - final) / 1e3), "(peak above the finished tree)")
+    print("insert rebuild keys/s:", round(n / insert_secs))
@@ -0,0 +1,85 @@
+'''
+    In order to run the benchmark:
+    1.  Make sure AVLTree.py, AVLFingerTree.py, AVLStats.py and this file
+        are all in the same directory.
+    2.  Run: python3 bench_instrumentation.py [n] [repeat]
+        (default n = 200000, repeat = 5)
+    3.  ns per operation is printed for every operation with no collector
+        and with an AVLStats collector, and the cost of counting in percent.
+'''
+
+import random
+import sys
+import time
+from AVLTree import AVLTree
+from AVLFingerTree import AVLFingerTree
+from AVLStats import AVLStats
+
+
+def run_tree(stats, keys, probes):
+    # ns per insert, finger_insert, search, finger_search and delete on one tree
+    t = AVLTree(stats)
+    start = time.perf_counter()
+    for k in keys:
+        t.insert(k, "")
+    insert = time.perf_counter() - start
+
+    f = AVLTree(stats)
+    start = time.perf_counter()
+    for k in sorted(keys):
+        f.finger_insert(k, "")
+    finger_insert = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for k in probes:
+        t.search(k)
+    search = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for k in probes:
+        t.finger_search(k)
+    finger_search = time.perf_counter() - start
+
+    gone = keys[: len(keys) // 2]
+    delete = 0.0
+    for k in gone:
+        node = t.search(k)[0]  # looked up each time, delete may move a key into another node
+        start = time.perf_counter()
+        t.delete(node)
+        delete += time.perf_counter() - start
+
+    n = len(keys)
+    return {"insert": insert * 1e9 / n, "finger_insert": finger_insert * 1e9 / n,
+            "search": search * 1e9 / len(probes), "finger_search": finger_search * 1e9 / len(probes),
+            "delete": delete * 1e9 / len(gone)}
+
+
+def run_sort(stats, arr):
+    start = time.perf_counter()
+    AVLFingerTree(stats).insertion_sort(arr)
+    return {"insertion_sort": (time.perf_counter() - start) * 1e9 / len(arr)}
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    random.seed(0)
+    keys = random.sample(range(10 * n), n)
+    probes = [random.choice(keys) for _ in range(n)]
+
+    # best of repeat runs per mode, alternating modes so drift hits both alike
+    best = {"off": {}, "on": {}}
+    for r in range(repeat):
+        for mode in ("off", "on"):
+            stats = AVLStats() if mode == "on" else None
+            times = run_tree(stats, keys, probes)
+            times.update(run_sort(stats, keys))
+            for op, ns in times.items():
+                best[mode][op] = min(ns, best[mode].get(op, ns))
+
+    print("n =", n, " best of", repeat)
+    print("%-15s %12s %12s %10s" % ("operation", "no stats", "AVLStats", "overhead"))
+    for op in best["off"]:
+        off = best["off"][op]
+        on = best["on"][op]
+        print("%-15s %9.0f ns %9.0f ns %9.1f%%" % (op, off, on, 100.0 * (on / off - 1)))
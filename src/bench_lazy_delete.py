@@ -0,0 +1,88 @@
+'''
+    In order to run the benchmark:
+    1.  Make sure AVLTree.py and this file are in the same directory.
+    2.  Run: python3 bench_lazy_delete.py [n] [ops]
+        (default n = 200000, ops = 1000000)
+    3.  Starting from n keys, ops operations are run: half delete_key of a
+        random live key (a session that expires) and half insert of a new
+        key. Throughput is printed for the usual delete and for lazy
+        deletion at a few thresholds, with ns per delete (rebuilds included)
+        and per insert.
+'''
+
+import random
+import sys
+import time
+from AVLTree import AVLTree
+
+
+def workload(n, ops, rnd):
+    # (op, key) pairs, op 0 = insert and 1 = delete, the live keys are tracked so that
+    # every delete hits a key that is there
+    live = rnd.sample(range(4 * (n + ops)), n)
+    start = list(live)
+    taken = set(live)
+    plan = []
+    for i in range(ops):
+        if i % 2:
+            j = rnd.randrange(len(live))
+            live[j], live[-1] = live[-1], live[j]
+            key = live.pop()
+            taken.discard(key)
+            plan.append((1, key))
+        else:
+            key = rnd.randrange(4 * (n + ops))
+            while key in taken:
+                key = rnd.randrange(4 * (n + ops))
+            taken.add(key)
+            live.append(key)
+            plan.append((0, key))
+    return start, plan, sorted(live)
+
+
+class Counting(AVLTree):
+    # counts the rebuilds of a lazy tree
+    def __init__(self, *args, **kwargs):
+        AVLTree.__init__(self, *args, **kwargs)
+        self.rebuilds = 0
+
+    def rebuild(self):
+        self.rebuilds += 1
+        AVLTree.rebuild(self)
+
+
+def run(lazy_threshold, start, plan, expected):
+    t = Counting(lazy_threshold=lazy_threshold)
+    for key in start:
+        t.insert(key, "")
+    insert, delete_key = t.insert, t.delete_key
+    clock = time.perf_counter
+    spent = [0.0, 0.0]  # insert, delete
+    for op, key in plan:
+        begin = clock()
+        if op:
+            delete_key(key)
+        else:
+            insert(key, "")
+        spent[op] += clock() - begin
+    assert list(t.keys()) == expected
+    return spent, t.rebuilds
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    ops = int(sys.argv[2]) if len(sys.argv) > 2 else 1000000
+    start, plan, expected = workload(n, ops, random.Random(0))
+
+    print("n =", n, " ops =", ops, " 50% deletes")
+    print("%-22s %10s %8s %10s %10s %9s" % ("", "ops/s", "speedup", "delete", "insert", "rebuilds"))
+    base = None
+    for threshold in (None, 0.1, 0.25, 0.5):
+        (t_insert, t_delete), rebuilds = run(threshold, start, plan, expected)
+        secs = t_insert + t_delete
+        if base is None:
+            base = secs
+        name = "eager delete" if threshold is None else "lazy, threshold %.2f" % threshold
+        half = ops // 2
+        print("%-22s %10.0f %7.2fx %7.0f ns %7.0f ns %9d"
+              % (name, ops / secs, base / secs, t_delete * 1e9 / half, t_insert * 1e9 / half, rebuilds))
@@ -0,0 +1,44 @@
+'''
+    In order to run the benchmark:
+    1.  Make sure your AVLTree.py file and this file
+        are both in the same directory.
+    2.  Run: python3 bench_node_memory.py [n]   (default n = 1000000)
+    3.  Bytes per key and insert throughput are printed at the end.
+'''
+
+import random
+import sys
+import time
+import tracemalloc
+from AVLTree import AVLTree
+
+
+def build(keys):
+    t = AVLTree()
+    start = time.perf_counter()
+    for k in keys:
+        t.insert(k, "")
+    return t, time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    keys = list(range(n))
+    random.seed(0)
+    random.shuffle(keys)
+
+    # memory: everything allocated while building the tree, keys excluded
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    t, _ = build(keys)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del t
+
+    # throughput is measured on a separate run without tracemalloc
+    t, secs = build(keys)
+
+    print("keys:            ", n)
+    print("bytes per key:   ", round((after - before) / n, 1))
+    print("inserts per sec: ", round(n / secs))
+    print("ns per insert:   ", round(secs * 1e9 / n))
@@ -0,0 +1,45 @@
+'''
+    In order to run the benchmark:
+    1.  Make sure AVLFingerTree.py, AVLStats.py, parallel_sort.py and this
+        file are all in the same directory.
+    2.  Run: python3 bench_parallel_sort.py [n] [max_workers]
+        (default n = 2000000, max_workers = os.cpu_count())
+    3.  The time of parallel_insertion_sort is printed for 1, 2, 4, ...
+        up to max_workers processes, with the speedup over the plain
+        insertion_sort in one process.
+'''
+
+import os
+import random
+import sys
+import time
+from AVLFingerTree import AVLFingerTree
+from parallel_sort import parallel_insertion_sort
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 2000000
+    max_workers = int(sys.argv[2]) if len(sys.argv) > 2 else (os.cpu_count() or 1)
+    random.seed(0)
+    arr = [random.randrange(10 * n) for _ in range(n)]
+
+    start = time.perf_counter()
+    expected = AVLFingerTree().insertion_sort(arr)[0]
+    base = time.perf_counter() - start
+    print("n =", n, " cores =", os.cpu_count())
+    print("insertion_sort, 1 process:      %8.2f s" % base)
+
+    workers = 2
+    counts = []
+    while workers < max_workers:
+        counts.append(workers)
+        workers *= 2
+    counts.append(max_workers)
+    for w in counts:
+        if w < 2:
+            continue
+        start = time.perf_counter()
+        out = parallel_insertion_sort(AVLFingerTree(), arr, workers=w)[0]
+        secs = time.perf_counter() - start
+        assert out == expected
+        print("parallel_insertion_sort, %3d:  %8.2f s  speedup %.2fx" % (w, secs, base / secs))
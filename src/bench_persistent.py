@@ -0,0 +1,85 @@
+'''
+    In order to run the benchmark:
+    1.  Make sure AVLTree.py, PersistentAVLTree.py and this file
+        are all in the same directory.
+    2.  Run: python3 bench_persistent.py [n] [versions]
+        (default n = 1000000, versions = 10000)
+    3.  The cost of creating a version and the memory it shares with
+        the previous one are printed, next to copying an AVLTree with
+        avl_to_array as a snapshot.
+'''
+
+import random
+import sys
+import time
+import tracemalloc
+from AVLTree import AVLTree
+from PersistentAVLTree import PersistentAVLTree, PAVLNode
+
+
+def count_nodes(version, old_ids):
+    # nodes of version that are not in the version whose ids are old_ids
+    new = 0
+    stack = [version.root]
+    while stack:
+        node = stack.pop()
+        if node is None or id(node) in old_ids:
+            continue  # a shared subtree is shared entirely
+        new += 1
+        stack.append(node.left)
+        stack.append(node.right)
+    return new
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    versions = int(sys.argv[2]) if len(sys.argv) > 2 else 10000
+    random.seed(0)
+    items = [(k, "") for k in range(0, 2 * n, 2)]
+    new_keys = [random.randrange(1, 2 * n, 2) for _ in range(versions)]
+
+    base = PersistentAVLTree.from_sorted(items)
+
+    # time without tracemalloc, then memory on a second run
+    p = base
+    start = time.perf_counter()
+    for k in new_keys:
+        p = p.insert(k, "")
+    secs = time.perf_counter() - start
+
+    p = base
+    history = []
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    for k in new_keys:
+        p = p.insert(k, "")
+        history.append(p.snapshot())
+    grown = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+
+    old_ids = set()
+    stack = [history[-2].root]
+    while stack:
+        node = stack.pop()
+        if node is not None:
+            old_ids.add(id(node))
+            stack.append(node.left)
+            stack.append(node.right)
+    fresh = count_nodes(history[-1], old_ids)
+
+    print("n =", n, " versions =", versions)
+    print("PersistentAVLTree")
+    print("  ns per new version:       ", round(secs * 1e9 / versions))
+    print("  bytes per new version:    ", round(grown / versions))
+    print("  nodes copied (last one):  ", fresh, "of", history[-1].size(),
+          "(%.5f%% not shared)" % (100.0 * fresh / history[-1].size()))
+    print("  bytes per node:           ", sys.getsizeof(PAVLNode(0, "", None, None)))
+
+    t = AVLTree.from_sorted(items)
+    copies = max(1, min(versions, 20))
+    start = time.perf_counter()
+    for _ in range(copies):
+        t.avl_to_array()
+    secs = time.perf_counter() - start
+    print("AVLTree + avl_to_array copy")
+    print("  ns per snapshot:          ", round(secs * 1e9 / copies))
@@ -0,0 +1,98 @@
+'''
+    In order to run the benchmark:
+    1.  Make sure AVLFingerTree.py and this file are in the same directory.
+    2.  Run: python3 bench_priority_queue.py [ops] [repeat]
+        (default ops = 1000000, repeat = 3)
+    3.  ns per operation is printed for AVLFingerTree push/pop_min/pop_max
+        and for heapq on the same mixed push/pop workloads. heapq has no
+        pop_max, so the double-ended workload runs on the tree alone.
+'''
+
+import heapq
+import random
+import sys
+import time
+from AVLFingerTree import AVLFingerTree
+
+
+def workload(name, ops, rnd):
+    # a list of (op, key) with op 0 = push, 1 = pop_min, 2 = pop_max,
+    # starting from a queue of ops // 10 keys so pops never hit an empty queue
+    warm = ops // 10
+    plan = []
+    size = warm
+    now = warm
+    for _ in range(ops):
+        if name == "random":  # random keys, half pushes and half pops
+            if size and rnd.random() < 0.5:
+                plan.append((1, None))
+                size -= 1
+            else:
+                plan.append((0, rnd.randrange(10 * ops)))
+                size += 1
+        elif name == "monotone":  # event queue: new keys are a little later than now
+            if size and rnd.random() < 0.5:
+                plan.append((1, None))
+                size -= 1
+            else:
+                now += 1
+                plan.append((0, now + rnd.randrange(100)))
+                size += 1
+        else:  # "double": random keys, pops from both ends
+            r = rnd.random()
+            if size and r < 0.25:
+                plan.append((1, None))
+                size -= 1
+            elif size and r < 0.5:
+                plan.append((2, None))
+                size -= 1
+            else:
+                plan.append((0, rnd.randrange(10 * ops)))
+                size += 1
+    return [rnd.randrange(10 * ops) if name != "monotone" else i for i in range(warm)], plan
+
+
+def run_tree(start, plan):
+    t = AVLFingerTree()
+    for k in start:
+        t.push(k)
+    push, pop_min, pop_max = t.push, t.pop_min, t.pop_max
+    begin = time.perf_counter()
+    for op, key in plan:
+        if op == 0:
+            push(key)
+        elif op == 1:
+            pop_min()
+        else:
+            pop_max()
+    return time.perf_counter() - begin
+
+
+def run_heap(start, plan):
+    h = list(start)
+    heapq.heapify(h)
+    heappush, heappop = heapq.heappush, heapq.heappop
+    begin = time.perf_counter()
+    for op, key in plan:
+        if op == 0:
+            heappush(h, key)
+        else:
+            heappop(h)
+    return time.perf_counter() - begin
+
+
+if __name__ == "__main__":
+    ops = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+    rnd = random.Random(0)
+
+    print("ops =", ops, " best of", repeat)
+    print("%-10s %14s %14s" % ("workload", "AVLFingerTree", "heapq"))
+    for name in ("random", "monotone", "double"):
+        start, plan = workload(name, ops, rnd)
+        tree = min(run_tree(start, plan) for _ in range(repeat))
+        if name == "double":
+            print("%-10s %11.0f ns %14s" % (name, tree * 1e9 / ops, "-"))
+        else:
+            heap = min(run_heap(start, plan) for _ in range(repeat))
+            print("%-10s %11.0f ns %11.0f ns" % (name, tree * 1e9 / ops, heap * 1e9 / ops))
@@ -0,0 +1,103 @@
+'''
+    In order to run the benchmark:
+    1.  Make sure AVLTree.py and this file are in the same directory.
+    2.  Run: python3 bench_split_join.py [n] [rounds]
+        (default n = 1000000, rounds = 100000)
+    3.  A tree of n keys is split at a random key and joined back, rounds
+        times, with the iterative AVLTree.split_key and with the recursive
+        split that allocates an AVLTree per level. us per split and per join
+        are printed with the number of AVLTree objects made per split.
+'''
+
+import random
+import sys
+import time
+import AVLTree as avl
+from AVLTree import AVLTree, VIRTUAL
+
+
+def split_recursive(tree, node, key):
+    # the former AVLTree.split_rec: one call, two trees and one join per level
+    if not node.is_real_node():
+        return AVLTree(), None, AVLTree()
+    if node.key < key:
+        left, mid, right = split_recursive(tree, node.right, key)
+        t = tree.detach_subtree(node.left)
+        t.join_node(left, node)
+        return t, mid, right
+    if node.key > key:
+        left, mid, right = split_recursive(tree, node.left, key)
+        t = tree.detach_subtree(node.right)
+        t.join_node(right, node)
+        return left, mid, t
+    small = tree.detach_subtree(node.left)
+    big = tree.detach_subtree(node.right)
+    node.left = VIRTUAL
+    node.right = VIRTUAL
+    node.parent = None
+    node.height = 0
+    node.size = 1
+    return small, node, big
+
+
+def split_iterative(tree, key):
+    return tree.split_key(key)
+
+
+def split_old(tree, key):
+    left, mid, right = split_recursive(tree, tree.root, key)
+    left.reset_fingers()
+    right.reset_fingers()
+    return left, mid, right
+
+
+class Counting(avl.AVLTree):
+    made = 0
+
+    def __init__(self, *args):
+        Counting.made += 1
+        super().__init__(*args)
+
+
+def run(split, n, probes):
+    tree = AVLTree.from_sorted((k, "") for k in range(0, 2 * n, 2))
+    t_split = 0.0
+    t_join = 0.0
+    for key in probes:
+        start = time.perf_counter()
+        left, mid, right = split(tree, key)
+        t_split += time.perf_counter() - start
+        start = time.perf_counter()
+        left.join_node(right, mid)
+        t_join += time.perf_counter() - start
+        tree = left
+    assert tree.size() == n
+    return t_split, t_join
+
+
+def trees_per_split(split, n, key):
+    # swaps the class used here and inside AVLTree.py for one that counts its instances
+    global AVLTree
+    tree = AVLTree.from_sorted((k, "") for k in range(0, 2 * n, 2))
+    plain = AVLTree
+    avl.AVLTree = AVLTree = Counting
+    Counting.made = 0
+    try:
+        split(tree, key)
+    finally:
+        avl.AVLTree = AVLTree = plain
+    return Counting.made
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    rounds = int(sys.argv[2]) if len(sys.argv) > 2 else 100000
+    random.seed(0)
+    probes = [2 * random.randrange(n) for _ in range(rounds)]
+
+    print("n =", n, " rounds =", rounds)
+    for name, split in (("iterative", split_iterative), ("recursive", split_old)):
+        t_split, t_join = run(split, n, probes)
+        made = trees_per_split(split, n, probes[0])
+        print("%-10s split %7.1f us  join %5.1f us  trees per split %3d"
+              % (name, t_split * 1e6 / rounds, t_join * 1e6 / rounds, made))
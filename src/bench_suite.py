@@ -0,0 +1,309 @@
+'''
+    In order to run the benchmark suite:
+    1.  Make sure AVLTree.py, AVLFingerTree.py and this file
+        are all in the same directory.
+    2.  Run: python3 bench_suite.py [--sizes 1000,10000,100000,1000000]
+             [--repeat 3] [--ops 10000] [--out results.json]
+             [--baseline old.json] [--tolerance 0.25]
+    3.  One line per case is printed, and every case is written to the
+        --out file as JSON: ns/op, ops/sec, latency percentiles, the
+        spread between repeats and the peak memory of the timed part.
+        With --baseline, cases that got slower than the baseline by more
+        than the tolerance are listed and the exit code is 1.
+
+    Cases are named "<operation>/<input order>/<n>". The AVLTree
+    operations are timed one call at a time on a tree that already holds
+    about n keys, using --ops calls per repeat. insertion_sort is timed as
+    a whole, so its ns/op is per element and its percentiles are taken
+    over the repeats. Every case runs once untimed as a warmup.
+'''
+
+import argparse
+import json
+import platform
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from AVLTree import AVLTree
+from AVLFingerTree import AVLFingerTree
+
+clock = time.perf_counter_ns
+
+
+def timer_overhead():
+    # the cost of the two clock calls around each timed operation, subtracted from every sample
+    best = None
+    for _ in range(10000):
+        t0 = clock()
+        t1 = clock()
+        if best is None or t1 - t0 < best:
+            best = t1 - t0
+    return best
+
+
+# ----------------------------
+# Input orders
+# ----------------------------
+
+def order_sorted(n, rnd):
+    return list(range(n))
+
+
+def order_reversed(n, rnd):
+    return list(range(n - 1, -1, -1))
+
+
+def order_random(n, rnd):
+    arr = list(range(n))
+    rnd.shuffle(arr)
+    return arr
+
+
+def order_swaps(n, rnd):
+    # sorted, then each adjacent pair is swapped with probability 1/2, as in student_tester_AVLFingerTree
+    arr = list(range(n))
+    for j in range(n - 1):
+        if rnd.random() < 0.5:
+            arr[j], arr[j + 1] = arr[j + 1], arr[j]
+    return arr
+
+
+ORDERS = {"sorted": order_sorted, "reversed": order_reversed,
+          "random": order_random, "swaps": order_swaps}
+
+
+# ----------------------------
+# Cases
+# ----------------------------
+# A case gets (n, order, ops, rnd, ready), does its untimed setup, calls
+# ready() and then returns {operation: [ns per op, ...]}.
+
+def prefilled(seq, ops):
+    # the tree after the first len(seq) - ops keys of seq were inserted, and the keys still to insert
+    ops = min(ops, len(seq))
+    rest = seq[len(seq) - ops:]
+    return AVLTree.from_sorted((k, "") for k in sorted(seq[:len(seq) - ops])), rest
+
+
+def case_insert(n, order, ops, rnd, ready):
+    tree, keys = prefilled(ORDERS[order](n, rnd), ops)
+    samples = []
+    ready()
+    for k in keys:
+        t0 = clock()
+        tree.insert(k, "")
+        samples.append(clock() - t0)
+    return {"AVLTree.insert": samples}
+
+
+def case_finger_insert(n, order, ops, rnd, ready):
+    tree, keys = prefilled(ORDERS[order](n, rnd), ops)
+    samples = []
+    ready()
+    for k in keys:
+        t0 = clock()
+        tree.finger_insert(k, "")
+        samples.append(clock() - t0)
+    return {"AVLTree.finger_insert": samples}
+
+
+def case_search(n, order, ops, rnd, ready):
+    tree = AVLTree.from_sorted((k, "") for k in range(n))
+    probes = ORDERS[order](n, rnd)[:ops]
+    search = tree.search
+    finger_search = tree.finger_search
+    plain = []
+    finger = []
+    ready()
+    for k in probes:
+        t0 = clock()
+        search(k)
+        plain.append(clock() - t0)
+    for k in probes:
+        t0 = clock()
+        finger_search(k)
+        finger.append(clock() - t0)
+    return {"AVLTree.search": plain, "AVLTree.finger_search": finger}
+
+
+def case_delete(n, order, ops, rnd, ready):
+    tree = AVLTree.from_sorted((k, "") for k in range(n))
+    keys = ORDERS[order](n, rnd)[:ops]
+    samples = []
+    ready()
+    for k in keys:
+        node = tree.search(k)[0] # looked up late, delete may move a key into another node
+        t0 = clock()
+        tree.delete(node)
+        samples.append(clock() - t0)
+    return {"AVLTree.delete": samples}
+
+
+def case_split_join(n, order, ops, rnd, ready):
+    # split at a key, then join the two halves back with it, so the tree keeps its size
+    tree = AVLTree.from_sorted((k, "") for k in range(n))
+    keys = ORDERS[order](n, rnd)[:ops]
+    split = []
+    join = []
+    ready()
+    for k in keys:
+        node = tree.search(k)[0]
+        t0 = clock()
+        left, right = tree.split(node)
+        t1 = clock()
+        left.join(right, k, "")
+        t2 = clock()
+        split.append(t1 - t0)
+        join.append(t2 - t1)
+        tree = left
+    return {"AVLTree.split": split, "AVLTree.join": join}
+
+
+def case_insertion_sort(n, order, ops, rnd, ready):
+    arr = ORDERS[order](n, rnd)
+    t = AVLFingerTree()
+    ready()
+    t0 = clock()
+    t.insertion_sort(arr)
+    return {"AVLFingerTree.insertion_sort": [(clock() - t0) / n]}
+
+
+def case_insertion_sort_adaptive(n, order, ops, rnd, ready):
+    arr = ORDERS[order](n, rnd)
+    t = AVLFingerTree()
+    ready()
+    t0 = clock()
+    t.insertion_sort(arr, adaptive=True)
+    return {"AVLFingerTree.insertion_sort_adaptive": [(clock() - t0) / n]}
+
+
+# (case, input orders); the per-call cases read keys in the given order
+CASES = [
+    (case_insert, ("sorted", "reversed", "random", "swaps")),
+    (case_finger_insert, ("sorted", "reversed", "random", "swaps")),
+    (case_search, ("random", "sorted")),
+    (case_delete, ("random",)),
+    (case_split_join, ("random",)),
+    (case_insertion_sort, ("sorted", "reversed", "random", "swaps")),
+    (case_insertion_sort_adaptive, ("sorted", "reversed", "random", "swaps")),
+]
+
+
+# ----------------------------
+# Running and reporting
+# ----------------------------
+
+def percentile(sorted_samples, p):
+    i = min(len(sorted_samples) - 1, int(p / 100.0 * len(sorted_samples)))
+    return sorted_samples[i]
+
+
+def summarize(runs, overhead):
+    # runs: one {operation: samples} per repeat -> {operation: stats}
+    out = {}
+    for op in runs[0]:
+        pooled = []
+        means = []
+        for run in runs:
+            samples = [max(0, s - overhead) for s in run[op]] if len(run[op]) > 1 else run[op]
+            pooled.extend(samples)
+            means.append(sum(samples) / len(samples))
+        pooled.sort()
+        ns = statistics.median(means)
+        out[op] = {
+            "ns_per_op": round(ns, 1),
+            "ops_per_sec": round(1e9 / ns) if ns > 0 else None,
+            "p50_ns": round(percentile(pooled, 50), 1),
+            "p90_ns": round(percentile(pooled, 90), 1),
+            "p99_ns": round(percentile(pooled, 99), 1),
+            "max_ns": round(pooled[-1], 1),
+            "stdev_between_repeats_ns": round(statistics.stdev(means), 1) if len(means) > 1 else 0.0,
+            "samples": len(pooled),
+            "repeats": len(runs),
+        }
+    return out
+
+
+def peak_memory(case, n, order, ops, seed):
+    # peak bytes allocated by the timed part alone, in a separate run since tracemalloc slows it down
+    try:
+        case(n, order, ops, random.Random(seed), tracemalloc.start)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def run_suite(sizes, repeat, ops, seed, only=None):
+    overhead = timer_overhead()
+    results = {}
+    for case, orders in CASES:
+        for order in orders:
+            for n in sizes:
+                if only is not None and only not in "%s/%s/%d" % (case.__name__[len("case_"):], order, n):
+                    continue
+                case(min(n, 1000), order, ops, random.Random(seed), lambda: None) # warmup
+                runs = [case(n, order, ops, random.Random(seed + r), lambda: None) for r in range(repeat)]
+                stats = summarize(runs, overhead)
+                peak = peak_memory(case, n, order, ops, seed)
+                for op, row in stats.items():
+                    name = "%s/%s/%d" % (op, order, n)
+                    row["peak_bytes"] = peak
+                    results[name] = row
+                    print("%-55s %12.1f ns/op %12s ops/s  p99 %10.1f ns  peak %8.1f KB" % (
+                        name, row["ns_per_op"], row["ops_per_sec"], row["p99_ns"], peak / 1e3))
+                    sys.stdout.flush()
+    return {"timer_overhead_ns": overhead, "results": results}
+
+
+def regressions(results, baseline, tolerance):
+    # cases present in both runs whose ns/op grew by more than tolerance
+    slower = []
+    for name, row in results.items():
+        old = baseline.get(name)
+        if old is not None and old["ns_per_op"] > 0 and row["ns_per_op"] > old["ns_per_op"] * (1 + tolerance):
+            slower.append((name, old["ns_per_op"], row["ns_per_op"]))
+    return slower
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="AVLTree / AVLFingerTree benchmark suite")
+    parser.add_argument("--sizes", default="1000,10000,100000,1000000",
+                        help="comma separated values of n")
+    parser.add_argument("--repeat", type=int, default=3, help="timed repeats per case")
+    parser.add_argument("--ops", type=int, default=10000, help="timed calls per repeat of a per-call case")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--only", default=None, help="run only the cases whose <case>/<order>/<n> contains this, e.g. split_join/random")
+    parser.add_argument("--out", default="bench_results.json", help="JSON file to write")
+    parser.add_argument("--baseline", default=None, help="JSON file of an earlier run to compare with")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="allowed slowdown against the baseline, 0.25 = 25%%")
+    args = parser.parse_args()
+
+    sizes = [int(s) for s in args.sizes.split(",")]
+    report = run_suite(sizes, args.repeat, args.ops, args.seed, args.only)
+    report["meta"] = {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "machine": platform.machine(),
+        "platform": platform.platform(),
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "sizes": sizes,
+        "repeat": args.repeat,
+        "ops": args.ops,
+        "seed": args.seed,
+    }
+    with open(args.out, "w") as f:
+        json.dump(report, f, indent=2, sort_keys=True)
+    print("wrote", args.out)
+
+    if args.baseline is not None:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+        slower = regressions(report["results"], baseline, args.tolerance)
+        for name, old, new in slower:
+            print("REGRESSION %-55s %10.1f -> %10.1f ns/op (+%.0f%%)" % (name, old, new, 100.0 * (new / old - 1)))
+        if slower:
+            sys.exit(1)
+        print("no regressions above %.0f%% against %s" % (100 * args.tolerance, args.baseline))
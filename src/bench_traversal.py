@@ -0,0 +1,73 @@
+'''
+    In order to run the benchmark:
+    1.  Make sure AVLTree.py, AVLFingerTree.py and this file
+        are all in the same directory.
+    2.  Run: python3 bench_traversal.py [n]   (default n = 10000000)
+    3.  The time of the old recursive exports and of the new
+        parent-pointer iteration is printed for both trees.
+'''
+
+import sys
+import time
+from AVLTree import AVLTree
+from AVLFingerTree import AVLFingerTree
+
+
+def recursive_avl_to_array(tree):
+    # the avl_to_array implementation this benchmark replaced
+    if tree.root is None:
+        return []
+    res = []
+    def inorder(curr):
+        if curr.is_real_node():
+            inorder(curr.left)
+            res.append((curr.key, curr.value))
+            inorder(curr.right)
+    inorder(tree.root)
+    return res
+
+
+def recursive_to_list(tree):
+    out = []
+    recursive_inorder_to_list(tree.root, out)
+    return out
+
+
+def recursive_inorder_to_list(node, out):
+    # the AVLFingerTree._inorder_to_list implementation this benchmark replaced
+    if node is None:
+        return
+    recursive_inorder_to_list(node.left, out)
+    freq = node.value
+    while freq > 0:
+        out.append(node.key)
+        freq -= 1
+    recursive_inorder_to_list(node.right, out)
+
+
+def timed(label, n, fn):
+    start = time.perf_counter()
+    out = fn()
+    secs = time.perf_counter() - start
+    assert len(out) == n
+    print("%-34s %8.3f s   %6.0f ns/item" % (label, secs, secs * 1e9 / n))
+    return secs
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 10000000
+
+    t = AVLTree.from_sorted((k, k) for k in range(n))
+    print("AVLTree, n =", n)
+    old = timed("  recursive avl_to_array", n, lambda: recursive_avl_to_array(t))
+    new = timed("  iterative avl_to_array", n, t.avl_to_array)
+    timed("  list(tree) (keys only)", n, lambda: list(t))
+    print("  speedup: %.2fx" % (old / new))
+    del t
+
+    f = AVLFingerTree()
+    f.insertion_sort(range(n))
+    print("AVLFingerTree, n =", n)
+    old = timed("  recursive _inorder_to_list", n, lambda: recursive_to_list(f))
+    new = timed("  iterative list(tree)", n, lambda: list(f))
+    print("  speedup: %.2fx" % (old / new))
